@@ -0,0 +1,181 @@
+"""
+Routage des lectures vers les réplicas de base de données.
+
+- Les écritures vont toujours sur la base principale ('default')
+- Les lectures ne vont sur un réplica que pendant une requête HTTP "sûre"
+  (GET/HEAD/OPTIONS) hors admin, marquée par ReplicaRoutingMiddleware
+- Après une écriture, le client est épinglé sur la base principale pendant
+  REPLICA_PIN_SECONDS (lecture de ses propres écritures)
+- Les réplicas sont choisis à tour de rôle ; un réplica injoignable, ou dont
+  une requête échoue (OperationalError), est écarté pendant
+  REPLICA_HEALTH_CHECK_INTERVAL secondes
+"""
+import itertools
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, OperationalError, connections, router as db_router
+
+PRIMARY = 'default'
+REPLICA_PREFIX = 'replica_'
+PIN_COOKIE_NAME = 'db_primary_pin'
+
+# Vrai uniquement pendant une requête dont les lectures peuvent aller sur un réplica
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_aliases():
+    """Alias des réplicas déclarés dans settings.DATABASES"""
+    return sorted(alias for alias in settings.DATABASES if alias.startswith(REPLICA_PREFIX))
+
+
+@contextmanager
+def replica_reads(allowed=True):
+    """Autorise (ou interdit) les lectures sur réplica dans le bloc"""
+    token = _replica_reads.set(allowed)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Routeur base principale / réplicas (voir DATABASE_ROUTERS)"""
+
+    def __init__(self, replicas=None):
+        self.replicas = list(replicas) if replicas is not None else replica_aliases()
+        self._cycle = itertools.cycle(self.replicas) if self.replicas else None
+        self._lock = threading.Lock()
+        # alias -> (sain, date de prochaine vérification)
+        self._health = {}
+
+    def is_healthy(self, alias):
+        """Vérifie (avec cache) qu'un réplica répond"""
+        now = time.monotonic()
+        cached = self._health.get(alias)
+        connection = connections[alias]
+        if cached is not None and now < cached[1]:
+            if not cached[0] or connection.connection is not None:
+                return cached[0]
+            # Sain en cache, mais ce thread doit se connecter : un échec écarte le réplica
+            try:
+                connection.ensure_connection()
+                return True
+            except DatabaseError:
+                connection.close()
+                self.mark_unhealthy(alias)
+                return False
+        try:
+            if connection.connection is None:
+                connection.ensure_connection()
+                healthy = True
+            else:
+                healthy = connection.is_usable()
+        except DatabaseError:
+            healthy = False
+        if not healthy:
+            connection.close()
+        self._health[alias] = (healthy, now + self.check_interval())
+        return healthy
+
+    def check_interval(self):
+        return getattr(settings, 'REPLICA_HEALTH_CHECK_INTERVAL', 30)
+
+    def mark_unhealthy(self, alias):
+        """Écarte le réplica jusqu'à la prochaine vérification"""
+        self._health[alias] = (False, time.monotonic() + self.check_interval())
+
+    def watch_failures(self, execute, sql, params, many, context):
+        """execute_wrapper : une OperationalError sur un réplica l'écarte aussitôt"""
+        try:
+            return execute(sql, params, many, context)
+        except OperationalError:
+            alias = context['connection'].alias
+            if alias in self.replicas:
+                self.mark_unhealthy(alias)
+            raise
+
+    def pick_replica(self):
+        """Réplica suivant en tourniquet, en sautant les réplicas indisponibles"""
+        if self._cycle is None:
+            return None
+        for _ in range(len(self.replicas)):
+            with self._lock:
+                alias = next(self._cycle)
+            if self.is_healthy(alias):
+                return alias
+        return None
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get():
+            return PRIMARY
+        return self.pick_replica() or PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Tous les alias contiennent les mêmes données
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Décide, requête par requête, si les lectures peuvent aller sur un réplica
+    et épingle le client sur la base principale après une écriture.
+    """
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response, router=None):
+        self.get_response = get_response
+        self._router = router
+
+    @property
+    def router(self):
+        """Routeur de DATABASE_ROUTERS dont les réplicas sont surveillés"""
+        if self._router is None:
+            self._router = next(
+                (router for router in db_router.routers if isinstance(router, PrimaryReplicaRouter)), None
+            )
+        return self._router
+
+    def is_read(self, request):
+        """Méthode sûre, ou POST en lecture seule (ex : /api/batch/)"""
+        if request.method in self.SAFE_METHODS:
+            return True
+        return request.method == 'POST' and request.path.startswith(
+            tuple(getattr(settings, 'REPLICA_READ_ONLY_PATHS', ()))
+        )
+
+    def primary_only(self, request):
+        if not self.is_read(request):
+            return True
+        if request.path.startswith(tuple(getattr(settings, 'REPLICA_PRIMARY_ONLY_PATHS', ()))):
+            return True
+        try:
+            pinned_until = float(request.COOKIES.get(PIN_COOKIE_NAME, 0))
+        except ValueError:
+            return False
+        return pinned_until > time.time()
+
+    def __call__(self, request):
+        allowed = not self.primary_only(request)
+        with replica_reads(allowed), ExitStack() as stack:
+            if allowed and self.router is not None:
+                for alias in self.router.replicas:
+                    stack.enter_context(connections[alias].execute_wrapper(self.router.watch_failures))
+            response = self.get_response(request)
+
+        if not self.is_read(request) and response.status_code < 400:
+            pin_seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+            response.set_cookie(
+                PIN_COOKIE_NAME, str(time.time() + pin_seconds),
+                max_age=pin_seconds,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite=settings.SESSION_COOKIE_SAMESITE,
+            )
+        return response
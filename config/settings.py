@@ -52,6 +52,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'config.db_router.ReplicaRoutingMiddleware',  # Lectures sur réplicas
+    'portfolio.query_budget.QueryBudgetMiddleware',  # Budgets de requêtes SQL
     'django.contrib.sessions.middleware.SessionMiddleware',
     # 'django.middleware.csrf.CsrfViewMiddleware',  # Désactivé pour développement
     'django.middleware.common.CommonMiddleware',
@@ -84,14 +86,42 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Configuration base de données
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# Connexions persistantes : ouvertes au préchauffage puis réutilisées par le worker
+DATABASE_CONN_MAX_AGE = config('DATABASE_CONN_MAX_AGE', default=60, cast=int)
+
 DATABASES = {
-    'default': config(
-        'DATABASE_URL',
-        default=f'sqlite:///{BASE_DIR / "db.sqlite3"}',
-        cast=dj_database_url.parse
+    'default': dj_database_url.parse(
+        config('DATABASE_URL', default=f'sqlite:///{BASE_DIR / "db.sqlite3"}'),
+        conn_max_age=DATABASE_CONN_MAX_AGE,
+        conn_health_checks=True,
     )
 }
 
+# Réplicas en lecture (optionnel), ex : DATABASE_REPLICA_URLS=postgres://r1/db,postgres://r2/db
+# En local : DATABASE_REPLICA_URLS=sqlite:///replica.sqlite3
+DATABASE_REPLICA_URLS = config(
+    'DATABASE_REPLICA_URLS',
+    default='',
+    cast=lambda v: [s.strip() for s in v.split(',') if s.strip()]
+)
+for index, url in enumerate(DATABASE_REPLICA_URLS):
+    DATABASES[f'replica_{index}'] = {
+        **dj_database_url.parse(url, conn_max_age=DATABASE_CONN_MAX_AGE, conn_health_checks=True),
+        # Les tests utilisent la base principale pour tous les alias
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['config.db_router.PrimaryReplicaRouter']
+
+# Durée pendant laquelle un client reste sur la base principale après une écriture
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+# Délai avant de revérifier l'état d'un réplica (sain, ou écarté après un échec)
+REPLICA_HEALTH_CHECK_INTERVAL = config('REPLICA_HEALTH_CHECK_INTERVAL', default=30, cast=int)
+# Chemins toujours servis par la base principale (admin Django et login admin)
+REPLICA_PRIMARY_ONLY_PATHS = ['/admin/', '/api/admin/']
+# POST en lecture seule (lectures sur réplica, pas d'épinglage)
+REPLICA_READ_ONLY_PATHS = ['/api/batch/']
+
 # Validation des mots de passe
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -128,6 +158,11 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Export statique du portfolio (commande export_static), servable par whitenoise
+# (WHITENOISE_ROOT) ou n'importe quel hébergement statique
+STATIC_EXPORT_ROOT = BASE_DIR / 'static_export'
+SITE_URL = config('SITE_URL', default='http://localhost:5173')
+
 # Configuration des médias
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -140,6 +175,15 @@ CLOUDINARY_STORAGE = {
 }
 DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 
+# Stockage local à la place de Cloudinary (tests de charge / hors ligne)
+USE_FAKE_STORAGE = config('USE_FAKE_STORAGE', default=False, cast=bool)
+if USE_FAKE_STORAGE:
+    FAKE_STORAGE_ROOT = BASE_DIR / 'media' / 'fake_cloudinary'
+    STORAGES = {
+        'default': {'BACKEND': 'portfolio.storage.FakeCloudinaryStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    }
+
 # Configuration CORS
 CORS_ALLOWED_ORIGINS = config(
     'CORS_ALLOWED_ORIGINS', 
@@ -189,6 +233,71 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Âge (jours) au-delà duquel les messages traités sont archivés (commande archive_contacts)
+CONTACT_ARCHIVE_AFTER_DAYS = config('CONTACT_ARCHIVE_AFTER_DAYS', default=90, cast=int)
+
+# Flux /api/changes/ : délai avant de publier une entrée du journal (transactions en cours).
+# Compté depuis l'insertion, pas le COMMIT : hors PostgreSQL (qui compare aussi les
+# instantanés, voir ChangeLog), il doit dépasser la plus longue transaction d'écriture,
+# sinon un seq inférieur validé tard est sauté (lots de archive_contacts : --batch-size)
+CHANGE_FEED_SETTLE_SECONDS = config('CHANGE_FEED_SETTLE_SECONDS', default=2, cast=int)
+
+# Taille de table au-delà de laquelle check_migration_locks signale les opérations bloquantes
+MIGRATION_LOCK_ROW_THRESHOLD = config('MIGRATION_LOCK_ROW_THRESHOLD', default=100000, cast=int)
+
+# Admin : au-delà de ce nombre de lignes, la pagination utilise l'estimation du planificateur
+ADMIN_ESTIMATED_COUNT_THRESHOLD = config('ADMIN_ESTIMATED_COUNT_THRESHOLD', default=100000, cast=int)
+# Durée de cache (secondes) des choix de filtres de l'admin
+ADMIN_FILTER_CHOICES_TIMEOUT = 300
+
+# Nombre maximal de sous-requêtes acceptées par /api/batch/
+BATCH_MAX_REQUESTS = config('BATCH_MAX_REQUESTS', default=20, cast=int)
+
+# Connexion admin : hachage borné et blocage des rafales (voir portfolio/login_guard.py)
+LOGIN_HASH_THREADS = config('LOGIN_HASH_THREADS', default=2, cast=int)
+LOGIN_HASH_QUEUE = config('LOGIN_HASH_QUEUE', default=4, cast=int)
+LOGIN_MAX_FAILURES = config('LOGIN_MAX_FAILURES', default=10, cast=int)
+LOGIN_LOCKOUT_SECONDS = config('LOGIN_LOCKOUT_SECONDS', default=900, cast=int)
+LOGIN_UNKNOWN_USERNAME_TIMEOUT = config('LOGIN_UNKNOWN_USERNAME_TIMEOUT', default=900, cast=int)
+
+# Cache des résultats de recherche de l'API (voir portfolio/search_cache.py)
+SEARCH_CACHE_BACKEND = config('SEARCH_CACHE_BACKEND', default='portfolio.search_cache.TinyLFUCache')
+SEARCH_CACHE_MAX_BYTES = config('SEARCH_CACHE_MAX_BYTES', default=4 * 1024 * 1024, cast=int)
+# Au-delà, la recherche n'est pas mise en cache (liste IN trop longue)
+SEARCH_CACHE_MAX_IDS = config('SEARCH_CACHE_MAX_IDS', default=500, cast=int)
+
+# Budgets de requêtes SQL par route (voir portfolio/query_budget.py)
+QUERY_BUDGET_ENABLED = config('QUERY_BUDGET_ENABLED', default=True, cast=bool)
+QUERY_BUDGET_DEFAULT = {'queries': 20, 'db_time_ms': 200}
+QUERY_BUDGETS = {
+    # Recherche : + version du contenu et identifiants (cache de recherche)
+    'project-list': {'queries': 5, 'db_time_ms': 100},
+    'project-detail': {'queries': 3, 'db_time_ms': 50},
+    'technology-list': {'queries': 4, 'db_time_ms': 50},
+    'category-list': {'queries': 2, 'db_time_ms': 50},
+    'contact-list': {'queries': 4, 'db_time_ms': 100},
+    'contact-detail': {'queries': 3, 'db_time_ms': 50},
+    'changes': {'queries': 12, 'db_time_ms': 200},
+    'batch': {'queries': 5 * BATCH_MAX_REQUESTS, 'db_time_ms': 500},
+}
+# Requêtes individuelles journalisées au-delà de cette durée
+SLOW_QUERY_MS = config('SLOW_QUERY_MS', default=100, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        # Une ligne JSON par événement (agrégée par query_budget_report)
+        'json_line': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'query_budget': {'class': 'logging.StreamHandler', 'stream': 'ext://sys.stdout', 'formatter': 'json_line'},
+    },
+    'loggers': {
+        'portfolio.query_budget': {'handlers': ['query_budget'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+
 # Documentation API
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Portfolio API',
@@ -0,0 +1,45 @@
+"""
+Configuration gunicorn : préchauffe chaque worker juste après le fork,
+avant qu'il n'accepte sa première requête.
+
+Workers à threads : une connexion admin en cours de hachage (voir
+portfolio/login_guard.py) n'immobilise pas tout le worker. Les connexions
+Django étant propres à chaque thread, celles ouvertes par post_fork (thread
+principal) ne servent pas aux requêtes : post_worker_init remplace le pool du
+worker par un pool dont chaque thread est démarré et connecté d'avance.
+"""
+import os
+
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+
+def post_fork(server, worker):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+
+    from portfolio.warmup import warm_up
+    try:
+        timings = warm_up(top=int(os.environ.get('WARMUP_TOP', 5)))
+    except Exception:
+        # Un échec du préchauffage ne doit pas empêcher le worker de servir
+        server.log.exception("Préchauffage du worker %s échoué", worker.pid)
+        return
+    total = sum(duration for _, duration in timings)
+    server.log.info("Worker %s préchauffé en %.1f ms : %s", worker.pid, total, timings)
+
+
+def post_worker_init(worker):
+    if getattr(worker, 'tpool', None) is None:
+        return
+    import time
+    from django.db import connections
+    from portfolio.warmup import warmed_thread_pool
+
+    start = time.perf_counter()
+    pool, worker.tpool = worker.tpool, warmed_thread_pool(worker.cfg.threads)
+    pool.shutdown(wait=False)
+    # Connexions du thread principal inutiles pour les requêtes
+    connections.close_all()
+    worker.log.info("Threads du worker %s connectés en %.1f ms", worker.pid, (time.perf_counter() - start) * 1000)
@@ -0,0 +1,8 @@
+"""
+Banc de tests de charge hors ligne (sans dépendance externe).
+
+    USE_FAKE_STORAGE=True python manage.py seed_loadtest
+    USE_FAKE_STORAGE=True python manage.py runserver --noreload
+    python -m loadtest --host http://127.0.0.1:8000 --users 20 --duration 30 --report report.json
+    python -m loadtest.compare before.json after.json
+"""
@@ -0,0 +1,81 @@
+"""Exécution headless : python -m loadtest --help"""
+import argparse
+import json
+import random
+import subprocess
+import threading
+import time
+
+from .client import HttpClient, Stats
+from .scenarios import DEFAULT_SCENARIOS, SCENARIOS, pick
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def virtual_user(index, args, stats, deadline):
+    rng = random.Random(args.seed + index)
+    client = HttpClient(args.host, stats, timeout=args.timeout)
+    scenario = pick(rng, args.scenarios)(client, rng)
+    scenario.on_start()
+    while time.monotonic() < deadline:
+        scenario.run()
+        if args.wait:
+            time.sleep(rng.uniform(0, args.wait))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test de charge headless du portfolio")
+    parser.add_argument('--host', default='http://127.0.0.1:8000')
+    parser.add_argument('--users', type=int, default=10, help="Utilisateurs virtuels simultanés")
+    parser.add_argument('--duration', type=float, default=30, help="Durée en secondes")
+    parser.add_argument('--wait', type=float, default=0.0, help="Pause aléatoire max entre itérations (s)")
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=DEFAULT_SCENARIOS)
+    parser.add_argument('--report', help="Fichier JSON du rapport (comparable avec loadtest.compare)")
+    args = parser.parse_args(argv)
+
+    stats = Stats()
+    deadline = time.monotonic() + args.duration
+    started = time.monotonic()
+    threads = [
+        threading.Thread(target=virtual_user, args=(index, args, stats, deadline), daemon=True)
+        for index in range(args.users)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    endpoints = stats.summary(elapsed)
+    total = sum(row['requests'] for row in endpoints.values())
+    report = {
+        'revision': git_revision(),
+        'users': args.users,
+        'duration_s': round(elapsed, 1),
+        'scenarios': args.scenarios,
+        'total_requests': total,
+        'total_errors': sum(row['errors'] for row in endpoints.values()),
+        'total_rps': round(total / elapsed, 2),
+        'endpoints': endpoints,
+    }
+
+    print(f"{'requête':<45} {'n':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for name, row in endpoints.items():
+        print(f"{name:<45} {row['requests']:>7} {row['errors']:>5} {row['rps']:>8} "
+              f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8}")
+    print(f"Total : {total} requêtes, {report['total_rps']} req/s, {report['total_errors']} erreur(s)")
+
+    if args.report:
+        with open(args.report, 'w') as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+
+class Stats:
+    """Collecte thread-safe des latences par requête nommée"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, name, latency_ms, ok):
+        with self._lock:
+            self.latencies[name].append(latency_ms)
+            if not ok:
+                self.errors[name] += 1
+
+    def summary(self, duration):
+        """Débit, percentiles et erreurs par requête, triés par nom"""
+        def percentile(values, p):
+            return round(values[min(len(values) - 1, int(len(values) * p / 100))], 1)
+
+        rows = {}
+        for name in sorted(self.latencies):
+            values = sorted(self.latencies[name])
+            rows[name] = {
+                'requests': len(values),
+                'errors': self.errors[name],
+                'rps': round(len(values) / duration, 2),
+                'p50_ms': percentile(values, 50),
+                'p95_ms': percentile(values, 95),
+                'p99_ms': percentile(values, 99),
+                'max_ms': round(values[-1], 1),
+            }
+        return rows
+
+
+class HttpClient:
+    """Client HTTP minimal (urllib) qui mesure chaque requête"""
+
+    def __init__(self, host, stats, timeout=10):
+        self.host = host.rstrip('/')
+        self.stats = stats
+        self.timeout = timeout
+        self.token = None
+
+    def request(self, method, path, name=None, data=None):
+        headers = {'Accept': 'application/json'}
+        body = None
+        if data is not None:
+            body = json.dumps(data).encode()
+            headers['Content-Type'] = 'application/json'
+        if self.token:
+            headers['Authorization'] = f'Token {self.token}'
+        request = urllib.request.Request(self.host + path, data=body, headers=headers, method=method)
+
+        start = time.perf_counter()
+        status, payload = 0, None
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                status = response.status
+                raw = response.read()
+        except urllib.error.HTTPError as error:
+            status = error.code
+            raw = error.read()
+        except OSError:
+            raw = b''
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        if raw:
+            try:
+                payload = json.loads(raw)
+            except ValueError:
+                payload = None
+        self.stats.record(f'{method} {name or path}', latency_ms, 200 <= status < 400)
+        return status, payload
+
+    def get(self, path, name=None):
+        return self.request('GET', path, name)
+
+    def post(self, path, data, name=None):
+        return self.request('POST', path, name, data)
+
+    def patch(self, path, data, name=None):
+        return self.request('PATCH', path, name, data)
+
+    def delete(self, path, name=None):
+        return self.request('DELETE', path, name)
@@ -0,0 +1,37 @@
+"""Compare deux rapports : python -m loadtest.compare avant.json apres.json"""
+import json
+import sys
+
+
+def delta(before, after):
+    if not before:
+        return '   n/a'
+    return f'{(after - before) / before * 100:+6.1f}%'
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        sys.exit("usage : python -m loadtest.compare avant.json apres.json")
+    with open(argv[0]) as handle:
+        before = json.load(handle)
+    with open(argv[1]) as handle:
+        after = json.load(handle)
+
+    print(f"{before.get('revision')} -> {after.get('revision')}")
+    print(f"{'requête':<45} {'rps':>9} {'p50':>9} {'p95':>9} {'erreurs':>9}")
+    for name in sorted(set(before['endpoints']) | set(after['endpoints'])):
+        old = before['endpoints'].get(name, {})
+        new = after['endpoints'].get(name, {})
+        if not new:
+            print(f"{name:<45} {'absente':>9}")
+            continue
+        print(f"{name:<45} {delta(old.get('rps'), new['rps']):>9} "
+              f"{delta(old.get('p50_ms'), new['p50_ms']):>9} "
+              f"{delta(old.get('p95_ms'), new['p95_ms']):>9} "
+              f"{new['errors'] - old.get('errors', 0):>+9}")
+    print(f"{'Total':<45} {delta(before['total_rps'], after['total_rps']):>9}")
+
+
+if __name__ == '__main__':
+    main()
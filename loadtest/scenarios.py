@@ -0,0 +1,153 @@
+"""
+Scénarios de charge. Chaque utilisateur virtuel choisit un scénario selon
+son poids, appelle on_start une fois puis run en boucle.
+"""
+SEARCH_TERMS = ['python', 'django', 'vue', 'react', 'docker', 'api', 'projet']
+
+
+class Scenario:
+    weight = 1
+
+    def __init__(self, client, rng):
+        self.client = client
+        self.rng = rng
+
+    def on_start(self):
+        pass
+
+    def run(self):
+        raise NotImplementedError
+
+
+class AnonymousBrowsing(Scenario):
+    """Visiteur : listes publiques puis détail de quelques projets"""
+    weight = 10
+
+    def run(self):
+        status, page = self.client.get('/api/projects/')
+        self.client.get('/api/categories/')
+        self.client.get('/api/technologies/')
+        if status == 200 and page and page.get('results'):
+            for project in self.rng.sample(page['results'], min(2, len(page['results']))):
+                self.client.get(f"/api/projects/{project['slug']}/", name='/api/projects/[slug]/')
+        if page and page.get('next'):
+            self.client.get('/api/projects/?page=2', name='/api/projects/?page=N')
+
+
+class Search(Scenario):
+    """Recherche plein texte et filtre par technologie"""
+    weight = 5
+
+    def run(self):
+        term = self.rng.choice(SEARCH_TERMS)
+        self.client.get(f'/api/projects/?search={term}', name='/api/projects/?search=')
+        self.client.get(f'/api/projects/?technology={term}', name='/api/projects/?technology=')
+        self.client.get(f'/api/technologies/?search={term}', name='/api/technologies/?search=')
+
+
+class ContactBurst(Scenario):
+    """Rafale d'envois du formulaire de contact"""
+    weight = 2
+
+    def run(self):
+        for _ in range(self.rng.randint(3, 8)):
+            self.client.post('/api/contact/', {
+                'nom': 'Charge',
+                'email': f'charge{self.rng.randint(0, 10 ** 6)}@example.com',
+                'type_projet': 'autre',
+                'message': 'Message envoyé par le banc de charge.',
+            })
+
+
+class AdminCrud(Scenario):
+    """
+    Administrateur : connexion par token puis traitement de la boîte de réception.
+    (ProjectViewSet n'accepte aucune authentification : le CRUD admin porte sur les contacts.)
+    """
+    weight = 1
+    username = 'loadtest'
+    password = 'loadtest-password'
+
+    def on_start(self):
+        status, payload = self.client.post(
+            '/api/admin/login/', {'username': self.username, 'password': self.password}
+        )
+        if status == 200:
+            self.client.token = payload['token']
+
+    def run(self):
+        status, page = self.client.get('/api/contact/?traite=false', name='/api/contact/?traite=')
+        self.client.get('/api/contact/?search=python', name='/api/contact/?search=')
+        if status != 200 or not page or not page.get('results'):
+            return
+        contact = self.rng.choice(page['results'])
+        path = f"/api/contact/{contact['id']}/"
+        self.client.get(path, name='/api/contact/[id]/')
+        self.client.patch(path, {'traite': True}, name='/api/contact/[id]/')
+        status, created = self.client.post('/api/contact/', {
+            'nom': 'Admin', 'email': 'admin@example.com',
+            'type_projet': 'autre', 'message': 'À supprimer',
+        }, name='/api/contact/ (admin)')
+        if status == 201:
+            self.client.delete(f"/api/contact/{created['id']}/", name='/api/contact/[id]/')
+
+
+HOME_PAGE_PATHS = ['/api/projects/', '/api/categories/', '/api/technologies/']
+
+
+class HomePage(Scenario):
+    """Chargement de la page d'accueil : une requête HTTP par ressource"""
+
+    def run(self):
+        for path in HOME_PAGE_PATHS:
+            self.client.get(path)
+
+
+class HomePageBatch(Scenario):
+    """Même page d'accueil en un seul aller-retour via /api/batch/"""
+
+    def run(self):
+        self.client.post('/api/batch/', {'requests': [{'path': path} for path in HOME_PAGE_PATHS]})
+
+
+class AdminLogin(Scenario):
+    """Connexion légitime d'un client par token (sans session)"""
+    username = AdminCrud.username
+    password = AdminCrud.password
+
+    def run(self):
+        self.client.post('/api/admin/login/', {
+            'username': self.username, 'password': self.password, 'session': False,
+        })
+
+
+class LoginAttack(Scenario):
+    """Force brute : mauvais mots de passe et noms d'utilisateur devinés"""
+    weight = 10
+
+    def run(self):
+        username = self.rng.choice([AdminCrud.username, 'admin', 'root', 'test'])
+        self.client.post('/api/admin/login/', {
+            'username': username, 'password': f'essai{self.rng.randint(0, 10 ** 6)}',
+        }, name='/api/admin/login/ (attaque)')
+
+
+SCENARIOS = {
+    'browse': AnonymousBrowsing,
+    'search': Search,
+    'contact': ContactBurst,
+    'admin': AdminCrud,
+    # Comparaison des allers-retours (à lancer séparément)
+    'home': HomePage,
+    'home-batch': HomePageBatch,
+    # Débit de connexion sous attaque (à lancer ensemble, séparément du reste)
+    'login': AdminLogin,
+    'login-attack': LoginAttack,
+}
+DEFAULT_SCENARIOS = ['admin', 'browse', 'contact', 'search']
+
+
+def pick(rng, names):
+    classes = [SCENARIOS[name] for name in names]
+    return rng.choices(classes, weights=[cls.weight for cls in classes])[0]
+
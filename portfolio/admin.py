@@ -1,18 +1,102 @@
+import json
+
+from django.conf import settings
 from django.contrib import admin
-from .models import Project, Contact
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from .models import Project, Contact, ArchivedContact, Technology
+from .signals import TECHNOLOGY_CHOICES_CACHE_KEY
+
+
+def estimate_count(queryset):
+    """Nombre de lignes estimé par le planificateur PostgreSQL (None ailleurs)"""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def is_unfiltered(queryset):
+    """Vrai si la requête n'a pas d'autre condition que celles du manager par défaut"""
+    return queryset.query.where == queryset.model._default_manager.all().query.where
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Pagination de l'admin sans COUNT(*) complet sur les grosses tables :
+    au-delà de ADMIN_ESTIMATED_COUNT_THRESHOLD lignes, le total affiché
+    est l'estimation du planificateur. Avec une recherche ou un filtre actif,
+    l'estimation peut être fausse de plusieurs ordres de grandeur (pages
+    vides ou lignes inaccessibles) : le comptage reste exact.
+    """
+
+    @cached_property
+    def count(self):
+        if not is_unfiltered(self.object_list):
+            return super().count
+        estimate = estimate_count(self.object_list)
+        if estimate is not None and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+            return estimate
+        return super().count
+
+
+class TechnologyListFilter(admin.SimpleListFilter):
+    """Filtre par technologie : choix lus dans Technology et mis en cache"""
+    title = 'technologie'
+    parameter_name = 'technology'
+
+    def lookups(self, request, model_admin):
+        return cache.get_or_set(
+            TECHNOLOGY_CHOICES_CACHE_KEY,
+            lambda: list(Technology.objects.order_by('name').values_list('pk', 'name')),
+            settings.ADMIN_FILTER_CHOICES_TIMEOUT,
+        )
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(technologies=self.value())
+        return queryset
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
     """Configuration de l'admin pour les projets"""
     list_display = ('titre', 'technologie', 'date_creation', 'est_publie')
-    list_filter = ('est_publie', 'technologie')
+    list_filter = ('est_publie', TechnologyListFilter)
+    filter_horizontal = ('technologies',)
     search_fields = ('titre', 'description', 'technologie')
     readonly_fields = ('slug',)
+    show_full_result_count = False
 
 @admin.register(Contact)
 class ContactAdmin(admin.ModelAdmin):
     """Configuration de l'admin pour les contacts"""
     list_display = ('nom', 'email', 'type_projet', 'date_envoi', 'traite')
     list_filter = ('traite', 'type_projet')
+    # Recherche servie par les index trigrammes (PostgreSQL, migration 0009)
     search_fields = ('nom', 'email', 'message')
     readonly_fields = ('date_envoi',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+@admin.register(ArchivedContact)
+class ArchivedContactAdmin(admin.ModelAdmin):
+    """Configuration de l'admin pour les contacts archivés (lecture seule)"""
+    list_display = ('nom', 'email', 'type_projet', 'date_envoi', 'date_archivage')
+    list_filter = ('type_projet',)
+    search_fields = ('nom', 'email', 'message')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class PortfolioConfig(AppConfig):
     name = 'portfolio'
+
+    def ready(self):
+        # Enregistrement des signaux (compteurs de technologies)
+        from . import signals  # noqa: F401
@@ -2,15 +2,18 @@ from rest_framework import status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.authtoken.models import Token
-from django.contrib.auth import authenticate, login
+from django.contrib.auth import login, user_logged_in
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
+from .login_guard import LoginThrottled, authenticate_staff
 
 
 @method_decorator(csrf_exempt, name='dispatch')
 class AdminLoginView(APIView):
     """
     Vue d'authentification par Token pour l'interface admin Vue.js.
+    Le client par token peut envoyer "session": false pour ne pas créer de
+    session Django. Voir login_guard pour la protection contre la force brute.
     """
     permission_classes = [permissions.AllowAny]
     authentication_classes = [] # On n'exige pas de token pour se connecter
@@ -19,15 +22,25 @@ class AdminLoginView(APIView):
         username = request.data.get('username')
         password = request.data.get('password')
         
-        user = authenticate(username=username, password=password)
+        try:
+            user = authenticate_staff(request, username, password)
+        except LoginThrottled as exc:
+            return Response({
+                'success': False,
+                'message': str(exc)
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS, headers={'Retry-After': str(exc.retry_after)})
         
         if user is not None:
             if user.is_staff:
                 # On crée ou récupère le token pour cet utilisateur
                 token, created = Token.objects.get_or_create(user=user)
                 
-                # Optionnel : On peut quand même connecter la session côté Django
-                login(request, user) 
+                # Session Django facultative : inutile pour un client par token
+                if str(request.data.get('session', 'true')).lower() not in ('false', '0'):
+                    login(request, user)
+                else:
+                    # last_login mis à jour comme avec login()
+                    user_logged_in.send(sender=user.__class__, request=request, user=user)
                 
                 return Response({
                     'success': True,
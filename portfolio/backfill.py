@@ -0,0 +1,170 @@
+"""
+Migrations de données par lots, hors du `migrate` bloquant.
+
+Un backfill parcourt une table par ordre de clé primaire (keyset : pk > dernier
+pk traité), en lots courts chacun dans sa propre transaction. La plage de clés
+est découpée en tranches traitées en parallèle par un pool de threads ; la
+progression de chaque tranche est enregistrée dans BackfillCheckpoint, ce qui
+permet d'interrompre puis de reprendre le traitement. Une pause entre deux lots
+limite la charge imposée à la base en production.
+
+    @register
+    class MonBackfill(Backfill):
+        name = 'mon_backfill'
+        model = MonModele
+        fields = ('source',)
+        update_fields = ('derive',)
+
+        def transform(self, pk, source):
+            return {'derive': calcul(source)}
+
+    python manage.py run_backfill mon_backfill --workers 4 --batch-size 1000 --sleep 0.05
+"""
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection, connections, transaction
+from django.db.models import F, Max, Min
+
+from .models import BackfillCheckpoint, Contact
+
+REGISTRY = {}
+
+
+def register(cls):
+    """Déclare un backfill exécutable par la commande run_backfill"""
+    REGISTRY[cls.name] = cls
+    return cls
+
+
+class Backfill:
+    name = None
+    model = None
+    fields = ()
+    update_fields = ()
+    # Taille des UPDATE ... CASE WHEN générés par bulk_update
+    update_batch_size = 500
+
+    def __init__(self, batch_size=1000, sleep=0.0, progress=None):
+        self.batch_size = batch_size
+        self.sleep = sleep
+        self.progress = progress or (lambda checkpoint: None)
+
+    def get_queryset(self):
+        """
+        Lignes à traiter. À filtrer sur les lignes pas encore à jour : un
+        backfill terminé dont le queryset n'est pas vide est replanifié
+        """
+        return self.model._default_manager.all()
+
+    def transform(self, pk, *values):
+        """
+        Retourne les nouvelles valeurs (hashables) de update_fields, ou None
+        pour ignorer la ligne
+        """
+        raise NotImplementedError
+
+    def plan(self, workers, reset=False):
+        """Crée (ou reprend) les tranches de clés primaires"""
+        if reset:
+            BackfillCheckpoint.objects.filter(name=self.name).delete()
+        existing = list(BackfillCheckpoint.objects.filter(name=self.name).order_by('shard'))
+        if existing and not all(checkpoint.done for checkpoint in existing):
+            return existing
+        if existing:
+            # Terminé : nouveau passage seulement si des lignes restent à traiter
+            if not self.get_queryset().exists():
+                return existing
+            BackfillCheckpoint.objects.filter(name=self.name).delete()
+
+        bounds = self.get_queryset().aggregate(low=Min('pk'), high=Max('pk'))
+        if bounds['low'] is None:
+            return []
+        low, high = bounds['low'], bounds['high']
+        step = max(1, -(-(high - low + 1) // workers))
+        checkpoints = []
+        for shard, start in enumerate(range(low, high + 1, step)):
+            end = min(start + step - 1, high)
+            checkpoints.append(BackfillCheckpoint(
+                name=self.name, shard=shard, start_pk=start, end_pk=end, last_pk=start - 1
+            ))
+        return BackfillCheckpoint.objects.bulk_create(checkpoints)
+
+    def apply(self, groups):
+        """Écrit les nouvelles valeurs d'un lot ({valeurs: [pk, ...]})"""
+        manager = self.model._default_manager
+        if len(groups) * 10 <= sum(len(pks) for pks in groups.values()):
+            for items, pks in groups.items():
+                manager.filter(pk__in=pks).update(**dict(items))
+        else:
+            objects = [self.model(pk=pk, **dict(items)) for items, pks in groups.items() for pk in pks]
+            manager.bulk_update(objects, self.update_fields, batch_size=self.update_batch_size)
+
+    def run_shard(self, checkpoint):
+        """Traite une tranche lot par lot, en sauvegardant la progression"""
+        queryset = self.get_queryset().filter(pk__lte=checkpoint.end_pk).order_by('pk')
+        last_pk = checkpoint.last_pk
+        while True:
+            rows = list(
+                queryset.filter(pk__gt=last_pk)
+                .values_list('pk', *self.fields)[:self.batch_size]
+            )
+            if not rows:
+                break
+            # Regroupement des lignes par valeurs identiques : un UPDATE ... WHERE pk IN
+            # par groupe est bien moins coûteux qu'un bulk_update (CASE WHEN par ligne)
+            groups = defaultdict(list)
+            for row in rows:
+                values = self.transform(*row)
+                if values is not None:
+                    groups[tuple(sorted(values.items()))].append(row[0])
+            last_pk = rows[-1][0]
+            with transaction.atomic():
+                self.apply(groups)
+                BackfillCheckpoint.objects.filter(pk=checkpoint.pk).update(
+                    last_pk=last_pk, rows=F('rows') + len(rows)
+                )
+            checkpoint.last_pk = last_pk
+            checkpoint.rows += len(rows)
+            self.progress(checkpoint)
+            if self.sleep:
+                time.sleep(self.sleep)
+        BackfillCheckpoint.objects.filter(pk=checkpoint.pk).update(done=True)
+        checkpoint.done = True
+        return checkpoint
+
+    def run_shard_in_thread(self, checkpoint):
+        try:
+            return self.run_shard(checkpoint)
+        finally:
+            # Chaque thread du pool a sa propre connexion
+            connections.close_all()
+
+    def run(self, workers=1, reset=False):
+        """Exécute le backfill ; retourne les points de contrôle finaux"""
+        if connection.vendor == 'sqlite':
+            # SQLite n'accepte qu'un écrivain à la fois
+            workers = 1
+        pending = [checkpoint for checkpoint in self.plan(workers, reset) if not checkpoint.done]
+        if workers == 1:
+            return [self.run_shard(checkpoint) for checkpoint in pending]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self.run_shard_in_thread, pending))
+
+
+# Backfills du projet
+
+@register
+class ContactEmailDomainBackfill(Backfill):
+    """Renseigne Contact.email_domain pour les messages antérieurs au champ"""
+    name = 'contact_email_domain'
+    model = Contact
+    fields = ('email',)
+    update_fields = ('email_domain',)
+
+    def get_queryset(self):
+        return Contact.objects.filter(email_domain__isnull=True)
+
+    def transform(self, pk, email):
+        return {'email_domain': email.rpartition('@')[2].lower() or None}
@@ -0,0 +1,68 @@
+from array import array
+
+import django_filters
+from django.conf import settings
+from rest_framework import filters
+
+from .models import Project, Technology
+from .search_cache import content_version, entry_size, search_cache, search_key
+
+
+class ProjectFilter(django_filters.FilterSet):
+    """
+    Filtres des projets.
+    - ?technology=<id> ou ?technology=<nom> (insensible à la casse)
+    """
+    technology = django_filters.CharFilter(method='filter_technology')
+
+    class Meta:
+        model = Project
+        fields = ['technology']
+
+    def filter_technology(self, queryset, name, value):
+        value = value.strip()
+        if value.isdigit():
+            # Recherche directe sur l'index technology_id de la table de liaison
+            return queryset.filter(technologies=value)
+        technology_ids = Technology.objects.filter(name__iexact=value).values('pk')
+        return queryset.filter(technologies__in=technology_ids).distinct()
+
+
+class CachedSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter dont les résultats (identifiants) sont mis en cache ; la
+    recherche devient un `pk IN (...)` tant que le modèle n'a pas changé.
+    Voir search_cache.py.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        search_fields = self.get_search_fields(view, request)
+        cache = search_cache()
+        if not terms or not search_fields or cache is None:
+            return super().filter_queryset(request, queryset, view)
+
+        key = search_key(view, search_fields, terms)
+        # Version lue avant la recherche : une écriture concurrente rend l'entrée obsolète
+        version = content_version(queryset.model)
+        if version is None:
+            # Modifications récentes pas encore stables : recherche classique, sans cache
+            return super().filter_queryset(request, queryset, view)
+        entry = cache.get(key)
+        if entry is not None and entry[0] == version:
+            if entry[1] is None:
+                # Résultat connu comme trop volumineux : recherche classique
+                return super().filter_queryset(request, queryset, view)
+            return queryset.filter(pk__in=list(entry[1]))
+
+        # Recherche seule sur le queryset de la vue (sans les autres filtres de la requête)
+        base = view.get_queryset().prefetch_related(None).order_by()
+        limit = settings.SEARCH_CACHE_MAX_IDS
+        ids = list(super().filter_queryset(request, base, view).values_list('pk', flat=True)[:limit + 1])
+        if len(ids) > limit:
+            # Trop de résultats pour un IN : seul ce constat est mis en cache
+            cache.set(key, (version, None), entry_size(key, None))
+            return super().filter_queryset(request, queryset, view)
+        ids = array('q', ids)
+        cache.set(key, (version, ids), entry_size(key, ids))
+        return queryset.filter(pk__in=list(ids))
@@ -0,0 +1,155 @@
+"""
+Protection du point de connexion admin contre les rafales de tentatives.
+
+- Le hachage du mot de passe (PBKDF2, volontairement coûteux) s'exécute dans
+  un pool de LOGIN_HASH_THREADS threads par processus, avec au plus
+  LOGIN_HASH_QUEUE tentatives en attente ; au-delà, la tentative est refusée
+  immédiatement (429) au lieu d'occuper un worker
+- Un nom d'utilisateur inexistant est mémorisé en cache pendant
+  LOGIN_UNKNOWN_USERNAME_TIMEOUT secondes : les tentatives suivantes échouent
+  sans hachage
+- Après LOGIN_MAX_FAILURES échecs depuis une même adresse IP, celle-ci est
+  bloquée pendant LOGIN_LOCKOUT_SECONDS, sans hachage (0 : désactivé)
+
+Le cache par défaut (mémoire locale) est propre à chaque processus : un cache
+partagé (CACHES) rend les compteurs communs à tous les workers.
+"""
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model, user_login_failed
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+
+
+class LoginThrottled(Exception):
+    """Tentative refusée sans vérification du mot de passe"""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = max(1, int(retry_after))
+
+
+class HashPool:
+    """Pool de threads borné : au plus threads + queue hachages en cours ou en attente"""
+
+    def __init__(self, threads, queue):
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='login-hash')
+        self.slots = threading.BoundedSemaphore(threads + queue)
+
+    def run(self, func, *args):
+        if not self.slots.acquire(blocking=False):
+            raise LoginThrottled("Trop de connexions simultanées, réessayez", retry_after=1)
+        try:
+            future = self.executor.submit(func, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future.result()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def hash_pool():
+    """Pool du processus courant (un par configuration)"""
+    key = (settings.LOGIN_HASH_THREADS, settings.LOGIN_HASH_QUEUE)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = HashPool(*key)
+        return _pools[key]
+
+
+def _digest(value):
+    return hashlib.sha256(str(value).encode()).hexdigest()
+
+
+def unknown_username_key(username):
+    return f'login:unknown:{_digest(username)}'
+
+
+def _failures_key(ip):
+    return f'login:failures:{_digest(ip)}'
+
+
+def _lockout_key(ip):
+    return f'login:lockout:{_digest(ip)}'
+
+
+def lockout_remaining(ip):
+    """Secondes de blocage restantes pour l'adresse IP (0 si aucune)"""
+    until = cache.get(_lockout_key(ip))
+    return max(0, until - time.time()) if until else 0
+
+
+def record_failure(request, ip, username):
+    user_login_failed.send(sender=__name__, credentials={'username': username}, request=request)
+    if not settings.LOGIN_MAX_FAILURES:
+        return
+    key, window = _failures_key(ip), settings.LOGIN_LOCKOUT_SECONDS
+    cache.add(key, 0, window)
+    try:
+        failures = cache.incr(key)
+    except ValueError:
+        # Clé expirée entre add() et incr()
+        cache.set(key, 1, window)
+        failures = 1
+    if failures >= settings.LOGIN_MAX_FAILURES:
+        cache.set(_lockout_key(ip), time.time() + window, window)
+
+
+def authenticate_staff(request, username, password):
+    """
+    Équivalent de authenticate() avec ModelBackend, protégé contre la force
+    brute. Retourne l'utilisateur, ou None si les identifiants sont incorrects ;
+    lève LoginThrottled si la tentative est refusée sans hachage.
+    """
+    ip = BaseThrottle().get_ident(request)
+    remaining = lockout_remaining(ip)
+    if remaining:
+        raise LoginThrottled("Trop de tentatives échouées, réessayez plus tard", retry_after=remaining)
+
+    if not username or not password:
+        record_failure(request, ip, username)
+        return None
+    if cache.get(unknown_username_key(username)):
+        record_failure(request, ip, username)
+        return None
+
+    UserModel = get_user_model()
+    try:
+        user = UserModel._default_manager.get_by_natural_key(username)
+    except UserModel.DoesNotExist:
+        # Hachage quand même (comme ModelBackend) : même durée qu'un mauvais mot de passe
+        hash_pool().run(make_password, password)
+        cache.set(unknown_username_key(username), True, settings.LOGIN_UNKNOWN_USERNAME_TIMEOUT)
+        record_failure(request, ip, username)
+        return None
+
+    # Seul le hachage part dans le pool ; les accès à la base restent dans ce thread
+    upgrade = []
+    valid = hash_pool().run(check_password, password, user.password, upgrade.append)
+    if valid and upgrade:
+        # Algorithme ou nombre d'itérations obsolète : nouveau hachage enregistré
+        # (reporté à la prochaine connexion si le pool est saturé)
+        try:
+            user.password = hash_pool().run(make_password, password)
+        except LoginThrottled:
+            pass
+        else:
+            user.save(update_fields=['password'])
+    if not valid or not getattr(user, 'is_active', True):
+        record_failure(request, ip, username)
+        return None
+
+    cache.delete(_failures_key(ip))
+    user.backend = MODEL_BACKEND
+    return user
@@ -0,0 +1,65 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from portfolio.models import ArchivedContact, Contact
+
+ARCHIVED_FIELDS = ['id', 'nom', 'email', 'type_projet', 'budget', 'message', 'date_envoi', 'traite']
+
+
+class Command(BaseCommand):
+    """
+    Déplace les messages traités plus anciens que --older-than-days vers
+    ArchivedContact, par lots transactionnels (copie puis suppression).
+    Interrompue, la commande reprend simplement là où elle s'était arrêtée.
+    Chaque lot écrit ses tombstones du journal dans sa transaction : hors
+    PostgreSQL, un lot doit durer moins que CHANGE_FEED_SETTLE_SECONDS.
+    """
+    help = "Archive les messages de contact traités anciens"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days', type=int, default=settings.CONTACT_ARCHIVE_AFTER_DAYS,
+            help="Âge minimal (jours) des messages traités à archiver"
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--sleep', type=float, default=0.0,
+            help="Pause entre deux lots (secondes) pour limiter la charge"
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Compte sans rien déplacer")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['older_than_days'])
+        candidates = Contact.objects.filter(traite=True, date_envoi__lt=cutoff)
+
+        if options['dry_run']:
+            self.stdout.write(f"{candidates.count()} message(s) à archiver avant {cutoff:%Y-%m-%d}")
+            return
+
+        archived = 0
+        while True:
+            start = time.monotonic()
+            with transaction.atomic():
+                batch = list(candidates.order_by('pk').values(*ARCHIVED_FIELDS)[:options['batch_size']])
+                if not batch:
+                    break
+                ArchivedContact.objects.bulk_create(
+                    [ArchivedContact(**row) for row in batch], ignore_conflicts=True
+                )
+                Contact.objects.filter(pk__in=[row['id'] for row in batch]).delete()
+            duration = time.monotonic() - start
+            if connection.vendor != 'postgresql' and duration > settings.CHANGE_FEED_SETTLE_SECONDS:
+                self.stderr.write(self.style.WARNING(
+                    f"Lot de {duration:.1f} s > CHANGE_FEED_SETTLE_SECONDS : réduire --batch-size "
+                    "pour que le flux /api/changes/ ne saute pas de suppressions"
+                ))
+            archived += len(batch)
+            self.stdout.write(f"{archived} message(s) archivé(s)...")
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f"{archived} message(s) archivé(s) au total"))
@@ -0,0 +1,185 @@
+from pathlib import Path
+from types import CodeType
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.migrations.operations.models import ModelOperation
+
+# Accès aux données dans le code d'un RunPython (Model.objects...)
+MANAGER_NAMES = {'objects', '_default_manager', '_base_manager'}
+
+
+class Command(BaseCommand):
+    """
+    Signale les opérations de migration qui verrouillent ou réécrivent une table
+    volumineuse (au-delà de MIGRATION_LOCK_ROW_THRESHOLD lignes), avant `migrate`.
+    Par défaut seules les migrations non appliquées des applications du projet
+    sont examinées ; les opérations de SeparateDatabaseAndState sont celles
+    exécutées en base (database_operations).
+    """
+    help = "Détecte les migrations bloquantes sur les grosses tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument('app_label', nargs='*', help="Applications examinées (applications du projet par défaut)")
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--all', action='store_true', help="Examiner aussi les migrations appliquées")
+        parser.add_argument('--threshold', type=int, default=settings.MIGRATION_LOCK_ROW_THRESHOLD)
+        parser.add_argument('--strict', action='store_true', help="Code de sortie non nul si une opération est signalée")
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        executor = MigrationExecutor(connection)
+        graph = executor.loader.graph
+        if options['all']:
+            keys = []
+            for leaf in graph.leaf_nodes():
+                keys += [key for key in graph.forwards_plan(leaf) if key not in keys]
+            migrations = [graph.nodes[key] for key in keys]
+        else:
+            migrations = [migration for migration, _ in executor.migration_plan(graph.leaf_nodes())]
+        app_labels = set(options['app_label']) or self.project_app_labels()
+        migrations = [migration for migration in migrations if migration.app_label in app_labels]
+
+        self.estimates = {}
+        findings = []
+        for migration in migrations:
+            for operation in self.database_operations(migration.operations):
+                reason = self.blocking_reason(operation, connection.vendor)
+                if reason is None:
+                    continue
+                tables = self.tables(migration.app_label, operation)
+                rows = self.estimate_tables(connection, tables)
+                if rows is None or rows >= options['threshold']:
+                    findings.append((migration, operation, tables, rows, reason))
+
+        for migration, operation, tables, rows, reason in findings:
+            volume = f"~{rows} lignes" if rows is not None else "volume inconnu"
+            self.stdout.write(self.style.WARNING(
+                f"{migration.app_label}.{migration.name} : {operation.describe()} "
+                f"[{', '.join(tables) or '?'}, {volume}] -> {reason}"
+            ))
+        if not findings:
+            self.stdout.write(self.style.SUCCESS("Aucune opération bloquante sur une grosse table"))
+        elif options['strict']:
+            raise CommandError(f"{len(findings)} opération(s) bloquante(s)")
+
+    def project_app_labels(self):
+        """Applications dont le code est dans le projet (ni Django ni paquets tiers)"""
+        root = Path(settings.BASE_DIR).resolve()
+        return {
+            config.label for config in apps.get_app_configs()
+            if Path(config.path).resolve().is_relative_to(root)
+            and not {'site-packages', 'dist-packages'} & set(Path(config.path).parts)
+        }
+
+    def database_operations(self, operations):
+        """Opérations exécutées en base, y compris dans SeparateDatabaseAndState"""
+        for operation in operations:
+            if type(operation).__name__ == 'SeparateDatabaseAndState':
+                yield from self.database_operations(operation.database_operations)
+            else:
+                yield operation
+
+    def code_names(self, code):
+        """Noms et chaînes constantes du code d'une fonction, fonctions imbriquées comprises"""
+        names = set(code.co_names)
+        for const in code.co_consts:
+            if isinstance(const, str):
+                names.add(const)
+            elif isinstance(const, CodeType):
+                names |= self.code_names(const)
+        return names
+
+    def blocking_reason(self, operation, vendor):
+        """Raison pour laquelle l'opération bloque la table, ou None"""
+        kind = type(operation).__name__
+        if kind == 'AddIndex':
+            return "construction d'index sous verrou (préférer AddIndexConcurrently sur PostgreSQL)"
+        if kind in ('AddConstraint', 'AlterUniqueTogether', 'AlterIndexTogether'):
+            return "validation/indexation sous verrou exclusif"
+        if kind == 'AlterField':
+            return "changement de type ou de contrainte : réécriture possible de la table"
+        if kind == 'RunPython':
+            code = getattr(operation.code, '__code__', None)
+            if code is None or not MANAGER_NAMES & self.code_names(code):
+                # Pas de parcours de données (ex. index CONCURRENTLY, noop)
+                return None
+            return "migration de données exécutée dans migrate : utiliser un backfill (run_backfill)"
+        if kind == 'RunSQL':
+            return "SQL brut exécuté dans migrate : verrous et volume à vérifier"
+        if kind in ('RemoveField', 'RenameField') and vendor == 'sqlite':
+            return "reconstruction complète de la table (SQLite)"
+        if kind == 'AddField':
+            field = operation.field
+            if field.many_to_many:
+                return None
+            if field.unique or field.db_index or field.is_relation:
+                return "nouvel index construit sous verrou"
+            if vendor == 'sqlite' and not field.null:
+                return "reconstruction complète de la table (SQLite)"
+        return None
+
+    def tables(self, app_label, operation):
+        """Tables touchées par l'opération (liste vide si inconnues)"""
+        if type(operation).__name__ == 'RunPython':
+            # Modèles nommés dans le code ou dans les constantes du module
+            # qu'il utilise (apps.get_model('app', 'Modele'), liste de noms...)
+            names = self.code_names(operation.code.__code__)
+            module_globals = getattr(operation.code, '__globals__', {})
+            for name in list(names):
+                value = module_globals.get(name)
+                if isinstance(value, str):
+                    names.add(value)
+                elif isinstance(value, (list, tuple, set, frozenset, dict)):
+                    names |= {item for item in value if isinstance(item, str)}
+            names = {name.lower() for name in names}
+            return sorted(
+                model._meta.db_table for model in apps.get_models()
+                if model._meta.model_name in names and model._meta.app_label in names | {app_label}
+            )
+        model_name = getattr(operation, 'model_name', None)
+        if model_name is None and isinstance(operation, ModelOperation):
+            model_name = operation.name_lower
+        if model_name is None:
+            # RunSQL : pas de table identifiable
+            return []
+        try:
+            return [apps.get_model(app_label, model_name)._meta.db_table]
+        except LookupError:
+            return [f"{app_label}_{model_name}"]
+
+    def estimate_tables(self, connection, tables):
+        """Plus grande estimation parmi les tables, ou None si l'une est inconnue"""
+        estimates = [self.estimate_rows(connection, table) for table in tables]
+        if not estimates or None in estimates:
+            return None
+        return max(estimates)
+
+    def estimate_rows(self, connection, table):
+        """
+        Estimation du nombre de lignes (statistiques du planificateur sur
+        PostgreSQL), ou None si la table n'a jamais été analysée (reltuples = -1)
+        """
+        if table in self.estimates:
+            return self.estimates[table]
+        try:
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+                else:
+                    cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+                row = cursor.fetchone()
+            if row is None:
+                rows = 0
+            elif row[0] < 0:
+                rows = None
+            else:
+                rows = row[0]
+        except DatabaseError:
+            # Table pas encore créée
+            rows = 0
+        self.estimates[table] = rows
+        return rows
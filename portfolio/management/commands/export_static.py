@@ -0,0 +1,118 @@
+import json
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from portfolio.models import Category, Project, Technology
+from portfolio.serializers import CategorySerializer, ProjectSerializer, TechnologySerializer
+
+MANIFEST = '.export-manifest.json'
+
+
+class Command(BaseCommand):
+    """
+    Exporte le portfolio publié en fichiers JSON statiques + sitemap.xml :
+
+        projects/page-<n>.json   listes paginées (même format que l'API)
+        projects/<slug>.json     détail de chaque projet publié
+        categories.json, technologies.json, sitemap.xml
+
+    L'export est incrémental : seuls les projets modifiés depuis le dernier
+    export sont re-rendus, et un fichier n'est réécrit que si son contenu change.
+    """
+    help = "Exporte le portfolio publié en JSON statique avec un sitemap.xml"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=str(settings.STATIC_EXPORT_ROOT))
+        parser.add_argument('--site-url', default=settings.SITE_URL, help="URL publique du front-end (sitemap)")
+        parser.add_argument('--full', action='store_true', help="Re-rendre tous les projets")
+
+    def handle(self, *args, **options):
+        self.root = Path(options['output'])
+        self.written = 0
+        manifest_path = self.root / MANIFEST
+        manifest = {}
+        if manifest_path.exists() and not options['full']:
+            manifest = json.loads(manifest_path.read_text())
+        last_export = manifest.get('last_export')
+
+        projects = (
+            Project.objects.filter(est_publie=True)
+            .prefetch_related('technologies')
+            .order_by('-date_creation', '-pk')
+        )
+
+        # Détails : uniquement les projets modifiés depuis le dernier export
+        # (date_mise_a_jour est une date : >= couvre les modifications du même jour)
+        changed = projects
+        if last_export:
+            changed = projects.filter(date_mise_a_jour__gte=last_export)
+        rendered = 0
+        for project in changed:
+            self.write(f'projects/{project.slug}.json', ProjectSerializer(project).data)
+            rendered += 1
+
+        # Retirer les projets dépubliés ou supprimés
+        published = dict(projects.values_list('slug', 'date_mise_a_jour'))
+        for slug in set(manifest.get('projects', [])) - set(published):
+            (self.root / 'projects' / f'{slug}.json').unlink(missing_ok=True)
+
+        self.write_pages(projects)
+        self.write('categories.json', CategorySerializer(Category.objects.order_by('name'), many=True).data)
+        self.write('technologies.json', TechnologySerializer(Technology.objects.order_by('name'), many=True).data)
+        self.write_sitemap(options['site_url'].rstrip('/'), published)
+
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps({
+            'last_export': timezone.localdate().isoformat(),
+            'projects': sorted(published),
+        }, indent=2))
+        self.stdout.write(self.style.SUCCESS(
+            f"{rendered} projet(s) rendu(s), {self.written} fichier(s) écrit(s) dans {self.root}"
+        ))
+
+    def write(self, relative_path, data):
+        """Écrit le fichier seulement si son contenu a changé"""
+        if not isinstance(data, (str, bytes)):
+            data = json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True)
+        if isinstance(data, str):
+            data = data.encode()
+        path = self.root / relative_path
+        if path.exists() and path.read_bytes() == data:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        self.written += 1
+
+    def write_pages(self, projects):
+        """Listes paginées comme l'API (PAGE_SIZE éléments par page)"""
+        page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+        items = list(projects)
+        count = len(items)
+        pages = max(1, -(-count // page_size))
+        for number in range(1, pages + 1):
+            self.write(f'projects/page-{number}.json', {
+                'count': count,
+                'next': f'page-{number + 1}.json' if number < pages else None,
+                'previous': f'page-{number - 1}.json' if number > 1 else None,
+                'results': ProjectSerializer(items[(number - 1) * page_size:number * page_size], many=True).data,
+            })
+        # Pages en trop d'un export précédent
+        stale = pages + 1
+        while (self.root / 'projects' / f'page-{stale}.json').exists():
+            (self.root / 'projects' / f'page-{stale}.json').unlink()
+            stale += 1
+
+    def write_sitemap(self, site_url, published):
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+        lastmod = max(published.values(), default=None)
+        lines.append(f'  <url><loc>{escape(site_url)}/</loc>'
+                     + (f'<lastmod>{lastmod.isoformat()}</lastmod>' if lastmod else '') + '</url>')
+        for slug, updated in sorted(published.items()):
+            lines.append(f'  <url><loc>{escape(site_url)}/projects/{escape(slug)}/</loc>'
+                         f'<lastmod>{updated.isoformat()}</lastmod></url>')
+        lines.append('</urlset>')
+        self.write('sitemap.xml', '\n'.join(lines) + '\n')
@@ -0,0 +1,72 @@
+import json
+import sys
+from collections import Counter, defaultdict
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Agrège les lignes JSON du logger 'portfolio.query_budget' (dépassements de
+    budget et requêtes lentes) pour classer les pires points de terminaison et
+    les origines des requêtes répétées. Les préfixes ajoutés par la plateforme
+    de logs (date, processus...) devant le JSON sont ignorés.
+    """
+    help = "Classe les dépassements de budget de requêtes SQL à partir des logs"
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='*', help="Fichiers de logs (entrée standard par défaut)")
+        parser.add_argument('--top', type=int, default=10)
+
+    def handle(self, *args, **options):
+        endpoints = defaultdict(lambda: {'violations': 0, 'max_queries': 0, 'max_db_time_ms': 0.0, 'excess': 0})
+        origins = Counter()
+        slow = defaultdict(lambda: {'count': 0, 'max_ms': 0.0, 'origin': None})
+
+        for event in self.events(options['files']):
+            if event.get('event') == 'query_budget_exceeded':
+                stats = endpoints[event.get('endpoint') or event.get('path')]
+                stats['violations'] += 1
+                stats['max_queries'] = max(stats['max_queries'], event['queries'])
+                stats['max_db_time_ms'] = max(stats['max_db_time_ms'], event['db_time_ms'])
+                stats['excess'] += max(0, event['queries'] - event['budget']['queries'])
+                for statement in event.get('top_statements', []):
+                    if statement['count'] > 1:
+                        origins[statement['origin']] += statement['count']
+            elif event.get('event') == 'slow_query':
+                stats = slow[event['sql']]
+                stats['count'] += 1
+                stats['max_ms'] = max(stats['max_ms'], event['time_ms'])
+                stats['origin'] = stats['origin'] or event.get('origin')
+
+        top = options['top']
+        self.stdout.write("Points de terminaison (dépassements, requêtes max, temps max, requêtes en trop) :")
+        ranked = sorted(endpoints.items(), key=lambda item: (-item[1]['violations'], -item[1]['excess']))
+        for endpoint, stats in ranked[:top]:
+            self.stdout.write(
+                f"  {endpoint:<30} {stats['violations']:>6} {stats['max_queries']:>6} "
+                f"{stats['max_db_time_ms']:>9.1f} ms {stats['excess']:>7}"
+            )
+        self.stdout.write("Origines des requêtes répétées :")
+        for origin, count in origins.most_common(top):
+            self.stdout.write(f"  {count:>7}  {origin}")
+        self.stdout.write("Requêtes lentes (occurrences, durée max) :")
+        for sql, stats in sorted(slow.items(), key=lambda item: -item[1]['count'])[:top]:
+            self.stdout.write(f"  {stats['count']:>7} {stats['max_ms']:>9.1f} ms  {stats['origin']}  {sql[:120]}")
+
+    def events(self, files):
+        if not files:
+            yield from self.parse(sys.stdin)
+        for name in files:
+            with open(name, encoding='utf-8') as stream:
+                yield from self.parse(stream)
+
+    def parse(self, lines):
+        for line in lines:
+            start = line.find('{"event"')
+            if start == -1:
+                continue
+            try:
+                yield json.loads(line[start:])
+            except ValueError:
+                continue
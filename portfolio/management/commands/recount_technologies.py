@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from portfolio.models import Project, Technology
+
+
+class Command(BaseCommand):
+    """
+    Recalcule Technology.project_count depuis la table de liaison.
+    Utile après des opérations en masse qui contournent les signaux
+    (QuerySet.update, bulk_create, SQL brut...).
+    """
+    help = "Recalcule le nombre de projets publiés par technologie"
+
+    def handle(self, *args, **options):
+        published = (
+            Project.technologies.through.objects
+            .filter(technology=OuterRef('pk'), project__est_publie=True)
+            .values('technology')
+            .annotate(total=Count('project'))
+            .values('total')
+        )
+        updated = Technology.objects.update(
+            project_count=Coalesce(Subquery(published), 0)
+        )
+        self.stdout.write(self.style.SUCCESS(f"{updated} technologie(s) recalculée(s)"))
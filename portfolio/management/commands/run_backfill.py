@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from portfolio.backfill import REGISTRY
+
+
+class Command(BaseCommand):
+    """
+    Exécute un backfill déclaré dans portfolio/backfill.py : lots ordonnés par
+    clé primaire, tranches en parallèle, reprise sur point de contrôle.
+    """
+    help = "Exécute une migration de données par lots (reprise possible)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', nargs='?', help="Backfill à exécuter (sans argument : liste)")
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--sleep', type=float, default=0.0, help="Pause entre deux lots (secondes)")
+        parser.add_argument('--reset', action='store_true', help="Repartir de zéro (ignore les points de contrôle)")
+
+    def handle(self, *args, **options):
+        if not options['name']:
+            for name, backfill_class in sorted(REGISTRY.items()):
+                self.stdout.write(f"{name} : {(backfill_class.__doc__ or '').strip()}")
+            return
+        if options['name'] not in REGISTRY:
+            raise CommandError(f"Backfill inconnu : {options['name']} (disponibles : {', '.join(sorted(REGISTRY))})")
+
+        started = time.monotonic()
+        last_report = [started]
+
+        def progress(checkpoint):
+            now = time.monotonic()
+            if now - last_report[0] >= 5:
+                last_report[0] = now
+                self.stdout.write(f"  tranche {checkpoint.shard} : pk {checkpoint.last_pk}/{checkpoint.end_pk}, "
+                                  f"{checkpoint.rows} ligne(s)")
+
+        backfill = REGISTRY[options['name']](
+            batch_size=options['batch_size'], sleep=options['sleep'], progress=progress
+        )
+        checkpoints = backfill.run(workers=options['workers'], reset=options['reset'])
+        rows = sum(checkpoint.rows for checkpoint in checkpoints)
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{options['name']} : {rows} ligne(s) traitée(s) en {elapsed:.1f} s "
+            f"({len(checkpoints)} tranche(s))"
+        ))
@@ -0,0 +1,92 @@
+import random
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from portfolio.models import Category, Contact, Project, Technology
+
+TECHNOLOGIES = [
+    'Python', 'Django', 'Vue.js', 'React', 'PostgreSQL', 'Docker',
+    'Tailwind', 'TypeScript', 'Node.js', 'Redis', 'Celery', 'FastAPI',
+]
+CATEGORIES = ['Web', 'Mobile', 'Script', 'API', 'Data']
+
+
+class Command(BaseCommand):
+    """
+    Remplit la base avec un jeu de données déterministe pour les tests de charge
+    (projets, technologies, catégories, messages de contact et compte admin).
+    """
+    help = "Génère un jeu de données reproductible pour les tests de charge"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--contacts', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--admin-username', default='loadtest')
+        parser.add_argument('--admin-password', default='loadtest-password')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG:
+            raise CommandError("seed_loadtest crée un compte admin connu : DEBUG=True requis")
+
+        rng = random.Random(options['seed'])
+
+        technologies = [Technology.objects.get_or_create(name=name)[0] for name in TECHNOLOGIES]
+        for name in CATEGORIES:
+            Category.objects.get_or_create(slug=name.lower(), defaults={'name': name})
+
+        existing = set(Project.objects.filter(slug__startswith='loadtest-').values_list('slug', flat=True))
+        projects = []
+        for index in range(options['projects']):
+            slug = f'loadtest-{index}'
+            if slug in existing:
+                continue
+            stack = rng.sample(TECHNOLOGIES, 3)
+            projects.append(Project(
+                titre=f'Projet {index} {stack[0]}',
+                slug=slug,
+                description=f'Projet de démonstration {index} réalisé avec {", ".join(stack)}.',
+                image_principale='projects/main/loadtest.png',
+                technologie=', '.join(stack),
+                est_publie=rng.random() > 0.1,
+            ))
+        Project.objects.bulk_create(projects, batch_size=500)
+
+        # Liens projet <-> technologie en masse (les compteurs sont recalculés ensuite)
+        by_name = {technology.name: technology for technology in technologies}
+        Link = Project.technologies.through
+        links = [
+            Link(project_id=project.pk, technology_id=by_name[name].pk)
+            for project in Project.objects.filter(slug__in=[p.slug for p in projects])
+            for name in project.technologie.split(', ')
+        ]
+        Link.objects.bulk_create(links, batch_size=1000, ignore_conflicts=True)
+        call_command('recount_technologies', stdout=self.stdout)
+
+        types = [choice for choice, _ in Contact.TYPES_PROJET]
+        Contact.objects.bulk_create([
+            Contact(
+                nom=f'Visiteur {index}',
+                email=f'visiteur{index}@example.com',
+                email_domain='example.com',
+                type_projet=rng.choice(types),
+                budget=rng.choice(['', '500€', '2000€', '10000€']),
+                message=f'Bonjour, je cherche un {rng.choice(TECHNOLOGIES)} freelance.',
+                traite=rng.random() > 0.5,
+            )
+            for index in range(options['contacts'])
+        ], batch_size=1000)
+
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(
+            username=options['admin_username'], defaults={'is_staff': True}
+        )
+        user.is_staff = True
+        user.set_password(options['admin_password'])
+        user.save()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(projects)} projet(s), {options['contacts']} contact(s), admin '{user.username}'"
+        ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from portfolio.warmup import warm_up
+
+
+class Command(BaseCommand):
+    """
+    Préchauffe le processus (URLconf, connexions, requêtes publiques) et
+    affiche la latence de chaque étape, à froid puis à chaud.
+    """
+    help = "Préchauffe l'application et mesure la latence des premières requêtes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top', type=int, default=5,
+            help="Nombre de projets récents dont le détail est préchauffé"
+        )
+
+    def handle(self, *args, **options):
+        timings = warm_up(top=options['top'])
+        for step, duration in timings:
+            self.stdout.write(f"{duration:>9.1f} ms  {step}")
+        total = sum(duration for _, duration in timings)
+        self.stdout.write(self.style.SUCCESS(f"Préchauffage terminé en {total:.1f} ms"))
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0002_alter_project_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='technologies',
+            field=models.ManyToManyField(blank=True, related_name='projets', to='portfolio.technology'),
+        ),
+        migrations.AddField(
+            model_name='technology',
+            name='project_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
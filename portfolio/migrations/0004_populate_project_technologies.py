@@ -0,0 +1,49 @@
+import re
+
+from django.db import migrations
+from django.db.models import Count, Q
+
+# Séparateurs rencontrés dans le champ libre `technologie` ("Django, Vue.js / Tailwind")
+SEPARATEURS = re.compile(r'\s*(?:[,;/|]|\bet\b)\s*', re.IGNORECASE)
+
+
+def populate_technologies(apps, schema_editor):
+    """Convertit le champ texte `technologie` en liens vers Technology"""
+    Project = apps.get_model('portfolio', 'Project')
+    Technology = apps.get_model('portfolio', 'Technology')
+
+    # Index insensible à la casse des technologies existantes
+    known = {}
+    for technology in Technology.objects.order_by('pk'):
+        known.setdefault(technology.name.strip().lower(), technology)
+
+    for project in Project.objects.exclude(technologie='').iterator():
+        technologies = []
+        for name in SEPARATEURS.split(project.technologie):
+            name = name.strip()
+            if not name:
+                continue
+            technology = known.get(name.lower())
+            if technology is None:
+                technology = Technology.objects.create(name=name)
+                known[name.lower()] = technology
+            technologies.append(technology)
+        project.technologies.add(*technologies)
+
+    # Initialisation des compteurs (projets publiés uniquement)
+    counts = Technology.objects.annotate(
+        total=Count('projets', filter=Q(projets__est_publie=True))
+    )
+    for technology in counts:
+        Technology.objects.filter(pk=technology.pk).update(project_count=technology.total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0003_technology_project_count_project_technologies'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_technologies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0004_populate_project_technologies'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedContact',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('nom', models.CharField(max_length=100)),
+                ('email', models.EmailField(max_length=254)),
+                ('type_projet', models.CharField(choices=[('site_vitrine', 'Site Vitrine'), ('app_web', 'Application Web'), ('script', 'Script / Automatisation'), ('autre', 'Autre')], max_length=50)),
+                ('budget', models.CharField(blank=True, max_length=100)),
+                ('message', models.TextField()),
+                ('date_envoi', models.DateTimeField()),
+                ('traite', models.BooleanField(default=True)),
+                ('date_archivage', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-date_envoi'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['traite', 'date_envoi'], name='contact_traite_date_idx'),
+        ),
+    ]
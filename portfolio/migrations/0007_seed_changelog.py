@@ -0,0 +1,28 @@
+from django.db import migrations
+
+JOURNALISES = ['category', 'technology', 'project', 'contact']
+
+
+def seed_changelog(apps, schema_editor):
+    """Journalise les enregistrements existants pour qu'un client parte de since=0"""
+    ChangeLog = apps.get_model('portfolio', 'ChangeLog')
+    for model_name in JOURNALISES:
+        Model = apps.get_model('portfolio', model_name)
+        entries = []
+        for pk in Model.objects.order_by('pk').values_list('pk', flat=True).iterator():
+            entries.append(ChangeLog(model=model_name, object_id=str(pk), action='created'))
+            if len(entries) >= 1000:
+                ChangeLog.objects.bulk_create(entries)
+                entries = []
+        ChangeLog.objects.bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0006_changelog'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_changelog, migrations.RunPython.noop),
+    ]
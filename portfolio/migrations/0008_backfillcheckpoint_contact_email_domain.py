@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0007_seed_changelog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contact',
+            name='email_domain',
+            field=models.CharField(blank=True, editable=False, max_length=254, null=True),
+        ),
+        migrations.CreateModel(
+            name='BackfillCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('shard', models.PositiveIntegerField()),
+                ('start_pk', models.BigIntegerField()),
+                ('end_pk', models.BigIntegerField()),
+                ('last_pk', models.BigIntegerField()),
+                ('rows', models.BigIntegerField(default=0)),
+                ('done', models.BooleanField(default=False)),
+                ('date_mise_a_jour', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('name', 'shard'), name='backfill_checkpoint_unique_shard')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+# Index trigrammes pour la recherche de l'admin (icontains -> UPPER(col::text) LIKE ...)
+TRIGRAM_INDEXES = {
+    'contact_nom_trgm_idx': 'nom',
+    'contact_email_trgm_idx': 'email',
+    'contact_message_trgm_idx': 'message',
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """PostgreSQL uniquement ; construits sans bloquer les écritures"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON portfolio_contact '
+            f'USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY est interdit dans une transaction
+    atomic = False
+
+    dependencies = [
+        ('portfolio', '0008_backfillcheckpoint_contact_email_domain'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations, models
+
+INDEX = models.Index(fields=['model', 'seq'], name='changelog_model_seq_idx')
+
+
+def create_index(apps, schema_editor):
+    """Sans bloquer les écritures du journal sur PostgreSQL"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS changelog_model_seq_idx '
+            'ON portfolio_changelog (model, seq)'
+        )
+    else:
+        schema_editor.add_index(apps.get_model('portfolio', 'ChangeLog'), INDEX)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX CONCURRENTLY IF EXISTS changelog_model_seq_idx')
+    else:
+        schema_editor.remove_index(apps.get_model('portfolio', 'ChangeLog'), INDEX)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY est interdit dans une transaction
+    atomic = False
+
+    dependencies = [
+        ('portfolio', '0009_contact_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunPython(create_index, drop_index)],
+            state_operations=[migrations.AddIndex(model_name='changelog', index=INDEX)],
+        ),
+    ]
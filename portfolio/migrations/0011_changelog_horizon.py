@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:23
+
+from django.db import migrations, models
+
+import portfolio.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0010_changelog_model_seq_index'),
+    ]
+
+    operations = [
+        # Valeur par défaut stable (pas volatile) : pas de réécriture de la table sur PostgreSQL
+        migrations.AddField(
+            model_name='changelog',
+            name='horizon',
+            field=models.BigIntegerField(db_default=portfolio.models.SnapshotBound('xmax'), editable=False, null=True),
+        ),
+    ]
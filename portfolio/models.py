@@ -1,14 +1,35 @@
-from django.db import models
+from datetime import timedelta
 
-class Technology(models.Model):
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Func, Q
+from django.utils import timezone
+
+class ChangeLoggedModel(models.Model):
+    """
+    Modèle dont les modifications sont journalisées dans ChangeLog.
+    L'enregistrement et son entrée de journal (signal post_save) sont écrits
+    dans la même transaction.
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using') or self._state.db or 'default'):
+            super().save(*args, **kwargs)
+
+class Technology(ChangeLoggedModel):
     """Modèle pour les technologies utilisées dans les projets"""
     name = models.CharField(max_length=100)
     logo = models.ImageField(upload_to='technologies/', blank=True, null=True)
+    # Compteur maintenu par les signaux (voir signals.py) : nombre de projets publiés
+    project_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
 
-class Category(models.Model):
+class Category(ChangeLoggedModel):
     """Modèle pour les catégories de projets"""
     name = models.CharField(max_length=100)
     slug = models.SlugField(unique=True)
@@ -24,13 +45,14 @@ class ImageProjet(models.Model):
     def __str__(self):
         return f"Image {self.id}"
 
-class Project(models.Model):
+class Project(ChangeLoggedModel):
     """Modèle principal pour les projets du portfolio"""
     titre = models.CharField(max_length=200)
     slug = models.SlugField(unique=True, blank=True)
     description = models.TextField()
     image_principale = models.ImageField(upload_to='projects/main/')
     technologie = models.CharField(max_length=200, default='', help_text="Technologie principale utilisée")
+    technologies = models.ManyToManyField(Technology, related_name='projets', blank=True)
     lien_github = models.URLField(blank=True)
     lien_demo = models.URLField(blank=True)
     date_creation = models.DateField(auto_now_add=True)
@@ -42,6 +64,14 @@ class Project(models.Model):
 
     def __str__(self):
         return self.titre
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Mémoriser l'état de publication pour mettre à jour les compteurs
+        if 'est_publie' in field_names:
+            instance._est_publie_initial = instance.est_publie
+        return instance
     
     def save(self, *args, **kwargs):
         # Générer le slug automatiquement à partir du titre
@@ -57,7 +87,7 @@ class Project(models.Model):
             self.slug = slug
         super().save(*args, **kwargs)
 
-class Contact(models.Model):
+class Contact(ChangeLoggedModel):
     """Modèle pour les messages de contact"""
     TYPES_PROJET = [
         ('site_vitrine', 'Site Vitrine'),
@@ -73,6 +103,135 @@ class Contact(models.Model):
     message = models.TextField()
     date_envoi = models.DateTimeField(auto_now_add=True)
     traite = models.BooleanField(default=False)
+    # Champ dérivé de l'email ; les lignes antérieures sont remplies par le
+    # backfill 'contact_email_domain' (commande run_backfill)
+    email_domain = models.CharField(max_length=254, blank=True, null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Sélection des messages traités à archiver
+            models.Index(fields=['traite', 'date_envoi'], name='contact_traite_date_idx'),
+        ]
 
     def __str__(self):
         return f"Message de {self.nom} - {self.date_envoi}"
+
+    def save(self, *args, **kwargs):
+        self.email_domain = self.email.rpartition('@')[2].lower() or None
+        super().save(*args, **kwargs)
+
+class ArchivedContact(models.Model):
+    """
+    Messages de contact traités et archivés (voir la commande archive_contacts).
+    Conserve l'identifiant d'origine ; la boîte de réception ne lit que Contact.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    nom = models.CharField(max_length=100)
+    email = models.EmailField()
+    type_projet = models.CharField(max_length=50, choices=Contact.TYPES_PROJET)
+    budget = models.CharField(max_length=100, blank=True)
+    message = models.TextField()
+    date_envoi = models.DateTimeField()
+    traite = models.BooleanField(default=True)
+    date_archivage = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-date_envoi']
+
+    def __str__(self):
+        return f"Archive de {self.nom} - {self.date_envoi}"
+
+class SnapshotBound(Func):
+    """
+    Borne de l'instantané de la transaction courante (PostgreSQL 13+) :
+    'xmin' = plus ancienne transaction encore en cours, 'xmax' = premier
+    identifiant de transaction non encore attribué. NULL sur les autres bases.
+    """
+    output_field = models.BigIntegerField()
+    # Utilisable comme valeur par défaut de colonne (db_default)
+    allowed_default = True
+
+    def __init__(self, bound):
+        super().__init__()
+        self.bound = bound
+
+    def deconstruct(self):
+        return 'portfolio.models.SnapshotBound', (self.bound,), {}
+
+    def __eq__(self, other):
+        return isinstance(other, SnapshotBound) and other.bound == self.bound
+
+    def __hash__(self):
+        return hash((SnapshotBound, self.bound))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return 'NULL', []
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return f'pg_snapshot_{self.bound}(pg_current_snapshot())::text::bigint', []
+
+
+class ChangeLog(models.Model):
+    """
+    Journal append-only des modifications (flux /api/changes/).
+    seq est strictement croissant et sert de jeton de synchronisation.
+
+    Les seq sont attribués à l'insertion mais validés dans l'ordre des
+    COMMIT : une entrée n'est publiée (settled) qu'une fois toutes les
+    transactions en cours lors de son insertion terminées. Sur PostgreSQL,
+    `horizon` (xmax de l'instantané à l'insertion) est comparé au xmin de
+    l'instantané courant, quelle que soit la durée des transactions ; ailleurs
+    seule l'ancienneté (CHANGE_FEED_SETTLE_SECONDS) est vérifiée.
+    """
+    ACTIONS = [
+        ('created', 'Création'),
+        ('updated', 'Modification'),
+        ('deleted', 'Suppression'),
+    ]
+
+    seq = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=50)
+    object_id = models.CharField(max_length=64)
+    action = models.CharField(max_length=10, choices=ACTIONS)
+    date = models.DateTimeField(auto_now_add=True)
+    # Transactions lancées avant l'insertion : identifiants < horizon (PostgreSQL)
+    horizon = models.BigIntegerField(null=True, editable=False, db_default=SnapshotBound('xmax'))
+
+    class Meta:
+        ordering = ['seq']
+        indexes = [
+            # Version du contenu par modèle (cache de recherche)
+            models.Index(fields=['model', 'seq'], name='changelog_model_seq_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.seq} {self.action} {self.model}:{self.object_id}"
+
+    @staticmethod
+    def settled():
+        """Condition des entrées publiables (voir la docstring de la classe)"""
+        settle = timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+        return Q(date__lte=timezone.now() - settle) & (
+            Q(horizon__isnull=True) | Q(horizon__lte=SnapshotBound('xmin'))
+        )
+
+class BackfillCheckpoint(models.Model):
+    """Progression d'un backfill par tranche de clés primaires (voir backfill.py)"""
+    # Clé 64 bits explicite (le projet ne définit pas DEFAULT_AUTO_FIELD)
+    id = models.BigAutoField(primary_key=True, verbose_name='ID')
+    name = models.CharField(max_length=100)
+    shard = models.PositiveIntegerField()
+    start_pk = models.BigIntegerField()
+    end_pk = models.BigIntegerField()
+    last_pk = models.BigIntegerField()
+    rows = models.BigIntegerField(default=0)
+    done = models.BooleanField(default=False)
+    date_mise_a_jour = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['name', 'shard'], name='backfill_checkpoint_unique_shard'),
+        ]
+
+    def __str__(self):
+        return f"{self.name}#{self.shard} ({self.last_pk}/{self.end_pk})"
@@ -0,0 +1,225 @@
+"""
+Budgets de requêtes SQL par point de terminaison et journal des requêtes lentes.
+
+QueryBudgetMiddleware installe un `execute_wrapper` sur chaque connexion le
+temps de la requête HTTP : nombre de requêtes, temps passé en base, requêtes
+répétées (signe d'un N+1) avec leur origine dans le code du projet.
+
+- Budget : QUERY_BUDGETS[nom de la route] (ex. 'project-list'), à défaut
+  QUERY_BUDGET_DEFAULT ; {'queries': nombre maximal, 'db_time_ms': durée maximale}
+- Dépassement : une ligne JSON {"event": "query_budget_exceeded", ...} sur le
+  logger 'portfolio.query_budget' ; chaque requête plus lente que
+  SLOW_QUERY_MS produit une ligne {"event": "slow_query", ...}
+- Agrégation : `python manage.py query_budget_report <fichier de logs>`
+- Tests : QueryBudgetAssertionsMixin.assertWithinQueryBudget(response)
+
+Les réponses en flux (exports) exécutent leurs requêtes après le middleware :
+elles ne sont pas comptées.
+"""
+import json
+import logging
+import re
+import sys
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('portfolio.query_budget')
+
+# Code tiers ignoré pour trouver l'origine d'une requête
+_IGNORED_PATHS = (str(Path(__file__).resolve()), 'site-packages', 'dist-packages')
+_PROJECT_ROOT = str(Path(settings.BASE_DIR).resolve())
+
+_IN_LIST = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_sql(sql):
+    """Forme canonique : littéraux remplacés, listes IN réduites, espaces compactés"""
+    sql = _IN_LIST.sub('(%s, ...)', sql)
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    return _SPACES.sub(' ', sql).strip()
+
+
+def _in_project(filename):
+    return filename.startswith(_PROJECT_ROOT) and not any(part in filename for part in _IGNORED_PATHS)
+
+
+_class_cache = {}
+
+
+def _project_class(cls):
+    """Vrai si la classe est définie dans le code du projet"""
+    if cls not in _class_cache:
+        module = sys.modules.get(cls.__module__)
+        _class_cache[cls] = _in_project(str(getattr(module, '__file__', None) or ''))
+    return _class_cache[cls]
+
+
+def query_origin():
+    """
+    Origine d'une requête : première ligne du code du projet dans la pile, ou
+    à défaut la méthode héritée exécutée pour une classe du projet (ex. la
+    sérialisation d'un ProjectSerializer par DRF) ; '?' si aucune
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        owner = frame.f_locals.get('self') if 'self' in code.co_varnames[:1] else None
+        if owner is not None and f'{type(owner).__module__}.{type(owner).__qualname__}' in settings.MIDDLEWARE:
+            # Les middlewares englobent tout : pas une origine utile
+            frame = frame.f_back
+            continue
+        filename = code.co_filename
+        if _in_project(filename):
+            return f'{Path(filename).relative_to(_PROJECT_ROOT)}:{frame.f_lineno} in {code.co_name}'
+        if owner is not None and _project_class(type(owner)):
+            return f'{type(owner).__module__}.{type(owner).__qualname__}.{code.co_name}'
+        frame = frame.f_back
+    return '?'
+
+
+class QueryRecorder:
+    """execute_wrapper : compte et chronomètre les requêtes, regroupées par texte SQL"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        # texte SQL -> [nombre, durée, origine de la première exécution]
+        self.statements = defaultdict(lambda: [0, 0.0, None])
+        self.slow = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.duration += duration
+            statement = self.statements[sql]
+            statement[0] += 1
+            statement[1] += duration
+            if statement[2] is None:
+                statement[2] = query_origin()
+            if duration * 1000 >= settings.SLOW_QUERY_MS:
+                self.slow.append({
+                    'sql': normalize_sql(sql), 'time_ms': round(duration * 1000, 2),
+                    'origin': statement[2], 'alias': context['connection'].alias,
+                })
+
+    @property
+    def db_time_ms(self):
+        return round(self.duration * 1000, 2)
+
+    def top_statements(self, limit=5):
+        """Requêtes les plus répétées (regroupées après normalisation)"""
+        grouped = defaultdict(lambda: {'count': 0, 'time_ms': 0.0, 'origin': None})
+        for sql, (count, duration, origin) in self.statements.items():
+            entry = grouped[normalize_sql(sql)]
+            entry['count'] += count
+            entry['time_ms'] += duration * 1000
+            entry['origin'] = entry['origin'] or origin
+        ranked = sorted(grouped.items(), key=lambda item: (-item[1]['count'], -item[1]['time_ms']))
+        return [
+            {'sql': sql, 'count': entry['count'], 'time_ms': round(entry['time_ms'], 2), 'origin': entry['origin']}
+            for sql, entry in ranked[:limit]
+        ]
+
+
+def budget_for(view_name):
+    budget = dict(settings.QUERY_BUDGET_DEFAULT)
+    budget.update(settings.QUERY_BUDGETS.get(view_name, {}))
+    return budget
+
+
+class QueryBudgetReport:
+    """Mesures d'une requête HTTP comparées au budget de sa route"""
+
+    def __init__(self, request, recorder):
+        match = getattr(request, 'resolver_match', None)
+        self.endpoint = match.view_name if match else None
+        self.method = request.method
+        self.path = request.path
+        self.recorder = recorder
+        self.budget = budget_for(self.endpoint)
+
+    @property
+    def queries(self):
+        return self.recorder.count
+
+    @property
+    def db_time_ms(self):
+        return self.recorder.db_time_ms
+
+    def violations(self):
+        exceeded = []
+        if self.queries > self.budget['queries']:
+            exceeded.append('queries')
+        if self.db_time_ms > self.budget['db_time_ms']:
+            exceeded.append('db_time_ms')
+        return exceeded
+
+    def as_dict(self):
+        return {
+            'event': 'query_budget_exceeded',
+            'endpoint': self.endpoint,
+            'method': self.method,
+            'path': self.path,
+            'queries': self.queries,
+            'db_time_ms': self.db_time_ms,
+            'budget': self.budget,
+            'exceeded': self.violations(),
+            'top_statements': self.recorder.top_statements(),
+        }
+
+
+class QueryBudgetMiddleware:
+    """Mesure les requêtes SQL de chaque requête HTTP (voir QUERY_BUDGET_ENABLED)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_BUDGET_ENABLED:
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        report = QueryBudgetReport(request, recorder)
+        # Exposé aux tests (assertWithinQueryBudget)
+        response.query_budget = report
+        for slow in recorder.slow:
+            logger.warning(json.dumps({
+                'event': 'slow_query', 'endpoint': report.endpoint,
+                'method': report.method, 'path': report.path, **slow,
+            }))
+        if report.violations():
+            logger.warning(json.dumps(report.as_dict()))
+        return response
+
+
+class QueryBudgetAssertionsMixin:
+    """Assertions de budget pour les TestCase (middleware actif requis)"""
+
+    def assertWithinQueryBudget(self, response, check_time=False):
+        report = getattr(response, 'query_budget', None)
+        if report is None:
+            self.fail("Réponse sans mesure : QueryBudgetMiddleware inactif ?")
+        exceeded = [name for name in report.violations() if check_time or name != 'db_time_ms']
+        if exceeded:
+            self.fail(
+                f"Budget dépassé pour {report.endpoint} ({', '.join(exceeded)}) : "
+                f"{report.queries} requêtes, {report.db_time_ms} ms (budget {report.budget})\n"
+                + json.dumps(report.recorder.top_statements(), indent=2, ensure_ascii=False)
+            )
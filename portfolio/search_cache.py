@@ -0,0 +1,170 @@
+"""
+Cache des résultats de recherche (?search=) des listes de l'API.
+
+Pour une recherche normalisée, on garde la liste des identifiants trouvés (pas
+les données sérialisées) ; la page est ensuite lue par une seule requête
+`pk IN (...)` qui conserve les autres filtres, le tri et la pagination.
+
+- Clé : vue, champs de recherche et termes normalisés (minuscules, sans
+  doublons, triés : SearchFilter combine les termes par ET)
+- Validité : chaque entrée porte la version du contenu du modèle, le dernier
+  seq du journal des modifications (ChangeLog) pour ce modèle ; toute
+  modification rend l'entrée obsolète, dans tous les processus. Les seq
+  peuvent être validés dans le désordre : tant que la dernière entrée n'est
+  pas publiable (ChangeLog.settled), une transaction ayant obtenu un seq
+  inférieur peut encore être en cours et rien n'est mis en cache
+- Éviction (TinyLFU) : la fréquence des clés est estimée par un sketch
+  Count-Min vieillissant ; une nouvelle entrée n'est admise que si elle est
+  plus demandée que les victimes tirées au sort, dans la limite de
+  SEARCH_CACHE_MAX_BYTES par processus
+- Implémentation remplaçable : SEARCH_CACHE_BACKEND (chemin d'une classe
+  exposant get / set / clear), vide pour désactiver le cache
+"""
+import random
+import sys
+import threading
+from array import array
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .models import ChangeLog
+
+
+class FrequencySketch:
+    """
+    Estimation Count-Min des fréquences d'accès (compteurs plafonnés à 15),
+    divisées par deux tous les `sample_size` accès pour oublier l'historique
+    """
+    MAX_COUNT = 15
+
+    def __init__(self, width=4096, depth=4, sample_size=None):
+        self.width = width
+        self.seeds = [random.getrandbits(32) for _ in range(depth)]
+        self.rows = [array('B', bytes(width)) for _ in range(depth)]
+        self.sample_size = sample_size or 10 * width
+        self.additions = 0
+
+    def _slots(self, key):
+        return [(row, hash((seed, key)) % self.width) for row, seed in zip(self.rows, self.seeds)]
+
+    def increment(self, key):
+        for row, index in self._slots(key):
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.age()
+
+    def frequency(self, key):
+        return min(row[index] for row, index in self._slots(key))
+
+    def age(self):
+        for row in self.rows:
+            for index, count in enumerate(row):
+                if count:
+                    row[index] = count >> 1
+        self.additions //= 2
+
+
+class TinyLFUCache:
+    """Cache en mémoire borné en octets, admission et éviction par fréquence"""
+    # Victimes candidates tirées au sort à chaque éviction
+    eviction_sample = 5
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = {}  # clé -> (valeur, taille)
+        self.used = 0
+        self.sketch = FrequencySketch()
+        self.hits = self.misses = self.rejections = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random()
+
+    def get(self, key):
+        with self._lock:
+            self.sketch.increment(key)
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, size):
+        """Ajoute l'entrée si elle est plus demandée que les victimes ; retourne vrai si admise"""
+        with self._lock:
+            if size > self.max_bytes:
+                return False
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.used -= previous[1]
+            frequency = self.sketch.frequency(key)
+            while self.used + size > self.max_bytes:
+                sample = self._rng.sample(list(self.entries), min(self.eviction_sample, len(self.entries)))
+                victim = min(sample, key=self.sketch.frequency)
+                if previous is None and self.sketch.frequency(victim) >= frequency:
+                    self.rejections += 1
+                    return False
+                self.used -= self.entries.pop(victim)[1]
+            self.entries[key] = (value, size)
+            self.used += size
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.used -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.used = 0
+
+    def stats(self):
+        return {
+            'entries': len(self.entries), 'bytes': self.used, 'hits': self.hits,
+            'misses': self.misses, 'rejections': self.rejections,
+        }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def search_cache():
+    """Cache du processus courant, ou None si SEARCH_CACHE_BACKEND est vide"""
+    key = (settings.SEARCH_CACHE_BACKEND, settings.SEARCH_CACHE_MAX_BYTES)
+    if not key[0]:
+        return None
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = import_string(key[0])(max_bytes=key[1])
+        return _caches[key]
+
+
+def search_key(view, search_fields, terms):
+    normalized = sorted({term.lower() for term in terms})
+    return '|'.join([type(view).__qualname__, ','.join(search_fields), *normalized])
+
+
+def content_version(model):
+    """
+    Dernier seq du journal des modifications pour ce modèle (0 si aucun), ou
+    None si cette entrée n'est pas encore publiable (voir ChangeLog.settled)
+    """
+    latest = (
+        ChangeLog.objects.filter(model=model._meta.model_name)
+        .annotate(settled=ChangeLog.settled())
+        .order_by('-seq').values_list('seq', 'settled').first()
+    )
+    if latest is None:
+        return 0
+    seq, settled = latest
+    return seq if settled else None
+
+
+def entry_size(key, ids):
+    """Taille approximative d'une entrée en mémoire"""
+    return sys.getsizeof(key) + sys.getsizeof(ids) + 64
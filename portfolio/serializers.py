@@ -1,11 +1,12 @@
 from rest_framework import serializers
-from .models import Project, Category, Technology, Contact, ImageProjet
+from .models import Project, Category, Technology, Contact, ArchivedContact, ImageProjet
 
 class TechnologySerializer(serializers.ModelSerializer):
     """Sérialiseur pour les technologies"""
     class Meta:
         model = Technology
-        fields = ['id', 'name', 'logo']
+        fields = ['id', 'name', 'logo', 'project_count']
+        read_only_fields = ['project_count']
 
 class CategorySerializer(serializers.ModelSerializer):
     """Sérialiseur pour les catégories"""
@@ -21,13 +22,18 @@ class ImageProjetSerializer(serializers.ModelSerializer):
 
 class ProjectSerializer(serializers.ModelSerializer):
     """Sérialiseur pour les projets simplifié"""
+    technologies = TechnologySerializer(many=True, read_only=True)
+    technologies_ids = serializers.PrimaryKeyRelatedField(
+        source='technologies', queryset=Technology.objects.all(),
+        many=True, write_only=True, required=False
+    )
 
     class Meta:
         model = Project
         fields = [
             'id', 'titre', 'slug', 'description', 'image_principale', 
-            'technologie', 'lien_github', 'lien_demo', 'date_creation', 
-            'date_mise_a_jour', 'est_publie'
+            'technologie', 'technologies', 'technologies_ids', 'lien_github', 
+            'lien_demo', 'date_creation', 'date_mise_a_jour', 'est_publie'
         ]
         lookup_field = 'slug'
 
@@ -36,3 +42,9 @@ class ContactSerializer(serializers.ModelSerializer):
     class Meta:
         model = Contact
         fields = '__all__'
+
+class ArchivedContactSerializer(serializers.ModelSerializer):
+    """Sérialiseur pour les contacts archivés (lecture seule)"""
+    class Meta:
+        model = ArchivedContact
+        fields = '__all__'
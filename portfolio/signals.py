@@ -0,0 +1,129 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from .login_guard import unknown_username_key
+from .models import Category, ChangeLog, Contact, Project, Technology
+
+# Choix du filtre "technologie" de l'admin, mis en cache
+TECHNOLOGY_CHOICES_CACHE_KEY = 'admin:technology-choices'
+
+# Modèles exposés par le flux /api/changes/
+CHANGE_LOGGED_MODELS = (Project, Category, Technology, Contact)
+
+
+def record_changes(model, object_ids, action):
+    """Ajoute des entrées au journal des modifications"""
+    ChangeLog.objects.bulk_create([
+        ChangeLog(model=model._meta.model_name, object_id=str(pk), action=action)
+        for pk in object_ids
+    ])
+
+
+def _shift_counts(technology_ids, delta):
+    """Ajoute `delta` au compteur de projets des technologies données"""
+    if technology_ids and delta:
+        Technology.objects.filter(pk__in=technology_ids).update(
+            project_count=F('project_count') + delta
+        )
+        record_changes(Technology, technology_ids, 'updated')
+
+
+def log_save(sender, instance, created, **kwargs):
+    """Journalise la création / modification (même transaction que save)"""
+    record_changes(sender, [instance.pk], 'created' if created else 'updated')
+
+
+def log_delete(sender, instance, **kwargs):
+    """Journalise une suppression (tombstone)"""
+    record_changes(sender, [instance.pk], 'deleted')
+
+
+for model in CHANGE_LOGGED_MODELS:
+    post_save.connect(log_save, sender=model, dispatch_uid=f'changelog_save_{model._meta.model_name}')
+    post_delete.connect(log_delete, sender=model, dispatch_uid=f'changelog_delete_{model._meta.model_name}')
+
+
+@receiver(m2m_changed, sender=Project.technologies.through)
+def log_link_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Un changement de technologies modifie le projet concerné"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        record_changes(Project, [instance.pk], 'updated')
+        return
+    # Vidage depuis une technologie : pk_set est vide, on reprend les liens
+    # mémorisés en pre_clear (ce récepteur passe avant update_counts_on_link_change)
+    project_ids = pk_set if action != 'post_clear' else instance.__dict__.get('_removed_link_pks')
+    if project_ids:
+        record_changes(Project, project_ids, 'updated')
+
+
+@receiver(m2m_changed, sender=Project.technologies.through)
+def update_counts_on_link_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Maintient Technology.project_count de façon incrémentale lors des
+    ajouts/retraits de liens projet <-> technologie (dans les deux sens).
+    """
+    if action in ('pre_remove', 'pre_clear'):
+        # Ne retenir que les liens réellement existants avant suppression
+        if reverse:
+            linked = Project.objects.filter(technologies=instance)
+        else:
+            linked = instance.technologies.all()
+        if action == 'pre_remove':
+            linked = linked.filter(pk__in=pk_set)
+        instance._removed_link_pks = set(linked.values_list('pk', flat=True))
+        return
+
+    if action == 'post_add':
+        delta = 1
+    elif action in ('post_remove', 'post_clear'):
+        delta = -1
+        pk_set = instance.__dict__.pop('_removed_link_pks', set())
+    else:
+        return
+
+    if not pk_set:
+        return
+
+    if reverse:
+        # instance est une Technology, pk_set contient des projets
+        published = Project.objects.filter(pk__in=pk_set, est_publie=True).count()
+        _shift_counts([instance.pk], delta * published)
+    elif instance.est_publie:
+        _shift_counts(pk_set, delta)
+
+
+@receiver(post_save, sender=Project)
+def update_counts_on_publication_change(sender, instance, created, update_fields=None, **kwargs):
+    """Répercute la (dé)publication d'un projet sur les compteurs"""
+    if update_fields is not None and 'est_publie' not in update_fields:
+        return
+    previous = getattr(instance, '_est_publie_initial', None)
+    instance._est_publie_initial = instance.est_publie
+    if created or previous is None or previous == instance.est_publie:
+        return
+    technology_ids = list(instance.technologies.values_list('pk', flat=True))
+    _shift_counts(technology_ids, 1 if instance.est_publie else -1)
+
+
+@receiver(pre_delete, sender=Project)
+def update_counts_on_project_delete(sender, instance, **kwargs):
+    """Les liens supprimés en cascade n'émettent pas m2m_changed"""
+    if instance.est_publie:
+        technology_ids = list(instance.technologies.values_list('pk', flat=True))
+        _shift_counts(technology_ids, -1)
+
+
+@receiver([post_save, post_delete], sender=Technology)
+def invalidate_technology_choices(sender, **kwargs):
+    """Les choix du filtre admin suivent les créations/renommages/suppressions"""
+    cache.delete(TECHNOLOGY_CHOICES_CACHE_KEY)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def forget_unknown_username(sender, instance, created, **kwargs):
+    """Un compte créé ou renommé n'est plus un nom d'utilisateur inconnu"""
+    cache.delete(unknown_username_key(instance.get_username()))
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+
+
+class FakeCloudinaryStorage(FileSystemStorage):
+    """
+    Stockage local remplaçant Cloudinary (tests de charge, développement hors ligne).
+    Les fichiers sont écrits sous FAKE_STORAGE_ROOT et servis depuis MEDIA_URL.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('location', getattr(settings, 'FAKE_STORAGE_ROOT', settings.MEDIA_ROOT))
+        kwargs.setdefault('base_url', settings.MEDIA_URL)
+        super().__init__(**kwargs)
@@ -3,7 +3,13 @@ from django.contrib.auth.models import User
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
-from .models import Project, Category, Technology, Contact, ImageProjet
+from django.test import RequestFactory, override_settings
+from django.core.management import call_command
+from io import StringIO
+from django.http import HttpResponse
+from config.db_router import PrimaryReplicaRouter, ReplicaRoutingMiddleware, replica_reads, PIN_COOKIE_NAME
+from .models import Project, Category, Technology, Contact, ArchivedContact, ImageProjet
+from .query_budget import QueryBudgetAssertionsMixin
 
 class ProjectModelTest(TestCase):
     """Tests pour le modèle Project"""
@@ -225,3 +231,836 @@ class ContactAPITest(APITestCase):
         url = reverse('contact-list')
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+class TechnologyIndexTest(APITestCase):
+    """Tests pour le lien projets <-> technologies et les compteurs"""
+    
+    def setUp(self):
+        """Configuration initiale : deux technologies, deux projets"""
+        self.python = Technology.objects.create(name="Python")
+        self.vue = Technology.objects.create(name="Vue.js")
+        self.api = Project.objects.create(titre="API", description="Backend")
+        self.front = Project.objects.create(titre="Front", description="Frontend")
+        self.api.technologies.add(self.python, self.vue)
+        self.front.technologies.add(self.vue)
+    
+    def assertCounts(self, python, vue):
+        self.python.refresh_from_db()
+        self.vue.refresh_from_db()
+        self.assertEqual(self.python.project_count, python)
+        self.assertEqual(self.vue.project_count, vue)
+    
+    def test_counts_follow_links(self):
+        """Les compteurs suivent ajouts, retraits et vidages"""
+        self.assertCounts(1, 2)
+        self.front.technologies.remove(self.vue, self.python)
+        self.assertCounts(1, 1)
+        self.vue.projets.clear()
+        self.assertCounts(1, 0)
+        self.python.projets.add(self.front)
+        self.assertCounts(2, 0)
+    
+    def test_counts_follow_publication_and_delete(self):
+        """Dépublier ou supprimer un projet décrémente les compteurs"""
+        self.api.est_publie = False
+        self.api.save()
+        self.assertCounts(0, 1)
+        self.api.est_publie = True
+        self.api.save()
+        self.assertCounts(1, 2)
+        self.api.delete()
+        self.assertCounts(0, 1)
+    
+    def test_filter_projects_by_technology(self):
+        """Filtre ?technology= par identifiant ou par nom"""
+        url = reverse('project-list')
+        response = self.client.get(url, {'technology': self.python.pk})
+        self.assertEqual([p['slug'] for p in response.data['results']], ['api'])
+        response = self.client.get(url, {'technology': 'vue.JS'})
+        self.assertEqual(response.data['count'], 2)
+    
+    def test_technology_list_exposes_counts(self):
+        """Le compteur est exposé sans agrégation"""
+        response = self.client.get(reverse('technology-list'), {'ordering': '-project_count'})
+        self.assertEqual(response.data['results'][0]['name'], "Vue.js")
+        self.assertEqual(response.data['results'][0]['project_count'], 2)
+
+class ReplicaRouterTest(TestCase):
+    """Tests pour le routage des lectures vers les réplicas"""
+    
+    def setUp(self):
+        """Routeur avec deux réplicas dont l'état est simulé"""
+        self.router = PrimaryReplicaRouter(replicas=['replica_0', 'replica_1'])
+        self.down = set()
+        self.router.is_healthy = lambda alias: alias not in self.down
+    
+    def test_reads_use_primary_outside_requests(self):
+        """Sans contexte de requête, tout va sur la base principale"""
+        self.assertEqual(self.router.db_for_read(Project), 'default')
+        self.assertEqual(self.router.db_for_write(Project), 'default')
+    
+    def test_round_robin_with_failover(self):
+        """Tourniquet entre réplicas, réplica indisponible écarté"""
+        with replica_reads():
+            picks = [self.router.db_for_read(Project) for _ in range(4)]
+            self.assertEqual(picks, ['replica_0', 'replica_1', 'replica_0', 'replica_1'])
+            self.down.add('replica_0')
+            self.assertEqual(self.router.db_for_read(Project), 'replica_1')
+            self.assertEqual(self.router.db_for_read(Project), 'replica_1')
+            self.down.add('replica_1')
+            self.assertEqual(self.router.db_for_read(Project), 'default')
+            self.assertEqual(self.router.db_for_write(Project), 'default')
+    
+    def test_middleware_routing_and_pinning(self):
+        """GET public sur réplica ; écriture, admin et client épinglé sur la principale"""
+        seen = []
+        
+        def view(request):
+            seen.append(self.router.db_for_read(Contact))
+            return HttpResponse(status=201 if request.method == 'POST' else 200)
+        
+        middleware = ReplicaRoutingMiddleware(view)
+        factory = RequestFactory()
+        middleware(factory.get('/api/projects/'))
+        response = middleware(factory.post('/api/contact/'))
+        middleware(factory.get('/admin/portfolio/contact/'))
+        pinned = factory.get('/api/projects/')
+        pinned.COOKIES[PIN_COOKIE_NAME] = response.cookies[PIN_COOKIE_NAME].value
+        middleware(pinned)
+        self.assertEqual(seen, ['replica_0', 'default', 'default', 'default'])
+    
+    def test_failing_replica_query_marks_replica_down(self):
+        """Une OperationalError sur un réplica l'écarte sans attendre la prochaine vérification"""
+        import time
+        from django.db import OperationalError, connection
+        # La base de test sert de réplica ; état sain déjà en cache
+        router = PrimaryReplicaRouter(replicas=['default'])
+        router._health['default'] = (True, time.monotonic() + 60)
+        
+        def view(request):
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT * FROM table_inexistante')
+            return HttpResponse()
+        
+        middleware = ReplicaRoutingMiddleware(view, router=router)
+        factory = RequestFactory()
+        with self.assertRaises(OperationalError):
+            middleware(factory.post('/api/contact/'))
+        self.assertTrue(router.is_healthy('default'))
+        with self.assertRaises(OperationalError):
+            middleware(factory.get('/api/projects/'))
+        self.assertFalse(router.is_healthy('default'))
+        self.assertIsNone(router.pick_replica())
+
+class WarmupTest(TestCase):
+    """Tests pour le préchauffage des workers"""
+    
+    def test_warmup_hits_public_routes(self):
+        """Le préchauffage joue les listes et les détails des derniers projets"""
+        from portfolio.warmup import warm_up
+        Project.objects.create(titre="Chaud", description="Projet récent")
+        steps = [step for step, _ in warm_up(top=1)]
+        self.assertIn('urlconf', steps)
+        self.assertIn('db:default', steps)
+        self.assertIn('cold GET /api/projects/chaud/', steps)
+        self.assertIn('warm GET /api/technologies/', steps)
+    
+    def test_warmed_thread_pool_connects_every_thread(self):
+        """Chaque thread du pool est démarré avec sa propre connexion ouverte"""
+        import threading
+        from django.db import connections
+        from portfolio.warmup import warmed_thread_pool
+        pool = warmed_thread_pool(3)
+        barrier = threading.Barrier(3)
+        
+        def state():
+            barrier.wait(5)
+            connected = connections['default'].connection is not None
+            connections.close_all()
+            return threading.get_ident(), connected
+        
+        results = [future.result() for future in [pool.submit(state) for _ in range(3)]]
+        pool.shutdown()
+        self.assertEqual(len({ident for ident, _ in results}), 3)
+        self.assertTrue(all(connected for _, connected in results))
+
+class LoadTestSeedTest(TestCase):
+    """Tests pour le jeu de données des tests de charge"""
+    
+    @override_settings(DEBUG=True)
+    def test_seed_is_idempotent(self):
+        """Le seed crée projets, liens, contacts et admin sans doublons"""
+        call_command('seed_loadtest', projects=5, contacts=10, stdout=StringIO())
+        call_command('seed_loadtest', projects=5, contacts=0, stdout=StringIO())
+        self.assertEqual(Project.objects.count(), 5)
+        self.assertEqual(Contact.objects.count(), 10)
+        self.assertTrue(User.objects.get(username='loadtest').is_staff)
+        published = Project.objects.filter(est_publie=True).count()
+        self.assertEqual(sum(Technology.objects.values_list('project_count', flat=True)), published * 3)
+    
+    def test_seed_refused_in_production(self):
+        """Pas de compte admin connu hors DEBUG"""
+        from django.core.management.base import CommandError
+        with self.assertRaises(CommandError):
+            call_command('seed_loadtest', stdout=StringIO())
+    
+    def test_fake_storage_urls(self):
+        """Le stockage local sert les fichiers depuis MEDIA_URL"""
+        from portfolio.storage import FakeCloudinaryStorage
+        storage = FakeCloudinaryStorage(location='/tmp/fake-storage')
+        self.assertEqual(storage.url('projects/main/a.png'), '/media/projects/main/a.png')
+
+class ContactArchiveTest(APITestCase):
+    """Tests pour l'archivage des messages traités"""
+    
+    def setUp(self):
+        """Messages récents/anciens, traités ou non"""
+        from datetime import timedelta
+        from django.utils import timezone
+        self.admin_user = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin123'
+        )
+        old = timezone.now() - timedelta(days=200)
+        for index, traite in enumerate([True, True, False, True]):
+            contact = Contact.objects.create(
+                nom=f"Contact {index}", email="c@example.com",
+                type_projet="autre", message="Bonjour", traite=traite
+            )
+            if index < 3:
+                Contact.objects.filter(pk=contact.pk).update(date_envoi=old)
+    
+    def test_archive_moves_old_processed_messages(self):
+        """Seuls les messages traités anciens quittent la boîte de réception"""
+        call_command('archive_contacts', older_than_days=90, batch_size=1, stdout=StringIO())
+        self.assertEqual(
+            sorted(ArchivedContact.objects.values_list('nom', flat=True)), ["Contact 0", "Contact 1"]
+        )
+        self.assertEqual(
+            sorted(Contact.objects.values_list('nom', flat=True)), ["Contact 2", "Contact 3"]
+        )
+        # Relancer la commande ne fait rien de plus
+        call_command('archive_contacts', older_than_days=90, stdout=StringIO())
+        self.assertEqual(ArchivedContact.objects.count(), 2)
+    
+    def test_archived_listing(self):
+        """?archived=true lit les archives, en lecture seule et pour les admins"""
+        call_command('archive_contacts', older_than_days=90, stdout=StringIO())
+        url = reverse('contact-list')
+        response = self.client.get(url, {'archived': 'true'})
+        self.assertIn(response.status_code, [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN])
+        self.client.force_authenticate(user=self.admin_user)
+        self.assertEqual(self.client.get(url).data['count'], 2)
+        response = self.client.get(url, {'archived': 'true'})
+        self.assertEqual(response.data['count'], 2)
+        response = self.client.post(url + '?archived=true', {})
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+class StaticExportTest(TestCase):
+    """Tests pour l'export statique du portfolio"""
+    
+    def setUp(self):
+        """Dossier d'export temporaire et deux projets"""
+        import tempfile
+        self.output = tempfile.mkdtemp()
+        self.first = Project.objects.create(titre="Premier", description="A")
+        self.second = Project.objects.create(titre="Second", description="B")
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.output)
+    
+    def export(self):
+        out = StringIO()
+        call_command('export_static', output=self.output, site_url='https://exemple.fr', stdout=out)
+        return out.getvalue()
+    
+    def test_export_files_and_sitemap(self):
+        """Détails, listes, référentiels et sitemap sont générés"""
+        import json, os
+        self.export()
+        with open(os.path.join(self.output, 'projects', 'premier.json')) as handle:
+            self.assertEqual(json.load(handle)['titre'], "Premier")
+        with open(os.path.join(self.output, 'projects', 'page-1.json')) as handle:
+            self.assertEqual(json.load(handle)['count'], 2)
+        with open(os.path.join(self.output, 'sitemap.xml')) as handle:
+            sitemap = handle.read()
+        self.assertIn('<loc>https://exemple.fr/projects/second/</loc>', sitemap)
+        self.assertIn(f'<lastmod>{self.first.date_mise_a_jour.isoformat()}</lastmod>', sitemap)
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'technologies.json')))
+    
+    def test_incremental_export(self):
+        """Un second export ne réécrit rien ; un projet dépublié est retiré"""
+        import os
+        self.export()
+        self.assertIn("0 fichier(s) écrit(s)", self.export())
+        self.second.est_publie = False
+        self.second.save()
+        self.export()
+        self.assertFalse(os.path.exists(os.path.join(self.output, 'projects', 'second.json')))
+
+@override_settings(CHANGE_FEED_SETTLE_SECONDS=0)
+class ChangeFeedTest(APITestCase):
+    """Tests pour le flux de modifications /api/changes/"""
+    
+    def setUp(self):
+        """Jeton initial puis quelques modifications"""
+        self.url = reverse('changes')
+        self.token = self.client.get(self.url).data['next']
+        self.python = Technology.objects.create(name="Python")
+        self.project = Project.objects.create(titre="Flux", description="A")
+        self.project.technologies.add(self.python)
+        Contact.objects.create(nom="Jean", email="j@example.com", type_projet="autre", message="M")
+    
+    def test_changes_since_token(self):
+        """Chaque enregistrement n'apparaît qu'une fois, dans sa dernière version"""
+        response = self.client.get(self.url, {'since': self.token})
+        changes = {(c['model'], c['id']): c for c in response.data['changes']}
+        self.assertEqual(set(changes), {('technology', str(self.python.pk)), ('project', str(self.project.pk))})
+        self.assertEqual(changes[('project', str(self.project.pk))]['data']['technologies'][0]['name'], "Python")
+        self.assertEqual(changes[('technology', str(self.python.pk))]['data']['project_count'], 1)
+        # Rien de nouveau depuis le jeton renvoyé
+        response = self.client.get(self.url, {'since': response.data['next']})
+        self.assertEqual(response.data['changes'], [])
+    
+    def test_entries_wait_for_transactions_running_at_insert(self):
+        """Une entrée reste cachée tant qu'une transaction en cours à son insertion n'est pas terminée"""
+        from unittest import mock
+        from portfolio.models import ChangeLog, SnapshotBound
+        token = self.client.get(self.url).data['next']
+        Category.objects.create(name="Web", slug="web")
+        self.python.name = "Python 3"
+        self.python.save()
+        # Horizon PostgreSQL simulé : transactions < 150 lancées avant ces insertions
+        ChangeLog.objects.filter(seq__gt=int(token)).update(horizon=150)
+        
+        def snapshot(xmin):
+            def as_sql(bound, compiler, connection, **extra_context):
+                return ('%s', [xmin]) if bound.bound == 'xmin' else ('NULL', [])
+            return mock.patch.object(SnapshotBound, 'as_sql', as_sql)
+        
+        with snapshot(100):
+            response = self.client.get(self.url, {'since': token})
+            self.assertEqual(response.data['changes'], [])
+            self.assertEqual(response.data['next'], token)
+            self.assertEqual(self.client.get(self.url).data['next'], token)
+        with snapshot(200):
+            response = self.client.get(self.url, {'since': token})
+            self.assertEqual({c['model'] for c in response.data['changes']}, {'category', 'technology'})
+    
+    def test_tombstones_and_contacts(self):
+        """Suppressions et dépublications deviennent des tombstones ; contacts réservés aux admins"""
+        token = self.client.get(self.url).data['next']
+        self.project.est_publie = False
+        self.project.save()
+        self.python.delete()
+        response = self.client.get(self.url, {'since': token})
+        self.assertEqual(
+            sorted((c['model'], c['action'], c['data']) for c in response.data['changes']),
+            [('project', 'deleted', None), ('technology', 'deleted', None)]
+        )
+        admin = User.objects.create_superuser(username='admin', email='a@example.com', password='x')
+        self.client.force_authenticate(user=admin)
+        response = self.client.get(self.url, {'since': self.token})
+        self.assertIn('contact', {c['model'] for c in response.data['changes']})
+    
+    def test_pagination_with_limit(self):
+        """has_more et next permettent de parcourir le journal par lots"""
+        response = self.client.get(self.url, {'since': self.token, 'limit': 1})
+        self.assertTrue(response.data['has_more'])
+        self.assertEqual(len(response.data['changes']), 1)
+    
+    def test_invalid_limit_is_rejected(self):
+        """limit < 1 est refusé au lieu de faire avancer le jeton sans rien renvoyer"""
+        for limit in (0, -1):
+            response = self.client.get(self.url, {'since': self.token, 'limit': limit})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_token_does_not_advance_without_changes(self):
+        """Sans entrée visible, next reste égal à since"""
+        Contact.objects.create(nom="Paul", email="p@example.com", type_projet="autre", message="M")
+        token = self.client.get(self.url).data['next']
+        response = self.client.get(self.url, {'since': self.token, 'limit': 1000})
+        self.assertEqual(response.data['next'], str(response.data['changes'][-1]['seq']))
+        response = self.client.get(self.url, {'since': response.data['next']})
+        self.assertEqual(response.data['changes'], [])
+        self.assertLess(int(response.data['next']), int(token))
+
+class BackfillTest(TestCase):
+    """Tests pour les migrations de données par lots"""
+    
+    def setUp(self):
+        """Messages dont le champ dérivé n'est pas encore rempli"""
+        for index in range(25):
+            Contact.objects.create(
+                nom=f"N{index}", email=f"n{index}@Exemple{index % 3}.fr",
+                type_projet="autre", message="M"
+            )
+        Contact.objects.update(email_domain=None)
+    
+    def test_backfill_in_chunks_with_checkpoints(self):
+        """Toutes les lignes sont traitées par lots et la progression est enregistrée"""
+        from portfolio.backfill import REGISTRY
+        from portfolio.models import BackfillCheckpoint
+        call_command('run_backfill', 'contact_email_domain', batch_size=4, stdout=StringIO())
+        self.assertFalse(Contact.objects.filter(email_domain__isnull=True).exists())
+        self.assertEqual(Contact.objects.get(nom="N4").email_domain, "exemple1.fr")
+        checkpoint = BackfillCheckpoint.objects.get(name='contact_email_domain')
+        self.assertTrue(checkpoint.done)
+        self.assertEqual(checkpoint.rows, 25)
+        # Terminé sans ligne restante : les points de contrôle sont conservés
+        REGISTRY['contact_email_domain']().run()
+        self.assertEqual(BackfillCheckpoint.objects.get(name='contact_email_domain').pk, checkpoint.pk)
+        # Terminé mais des lignes correspondent de nouveau : nouveau passage complet
+        Contact.objects.filter(nom__in=["N1", "N2"]).update(email_domain=None)
+        checkpoints = REGISTRY['contact_email_domain']().run()
+        self.assertFalse(Contact.objects.filter(email_domain__isnull=True).exists())
+        self.assertEqual(sum(checkpoint.rows for checkpoint in checkpoints), 2)
+    
+    def test_resume_after_interruption(self):
+        """Un backfill interrompu reprend après le dernier lot validé"""
+        from portfolio.backfill import REGISTRY
+        
+        class Interrupted(Exception):
+            pass
+        
+        def stop_after_first_batch(checkpoint):
+            raise Interrupted
+        
+        backfill = REGISTRY['contact_email_domain'](batch_size=10, progress=stop_after_first_batch)
+        with self.assertRaises(Interrupted):
+            backfill.run()
+        self.assertEqual(Contact.objects.filter(email_domain__isnull=True).count(), 15)
+        REGISTRY['contact_email_domain'](batch_size=10).run()
+        self.assertFalse(Contact.objects.filter(email_domain__isnull=True).exists())
+    
+    def test_lock_check_flags_blocking_operations(self):
+        """Les opérations bloquantes des migrations sont signalées"""
+        out = StringIO()
+        call_command('check_migration_locks', all=True, threshold=0, stdout=out)
+        self.assertIn("contact_traite_date_idx", out.getvalue())
+        self.assertIn("0004_populate_project_technologies", out.getvalue())
+        self.assertNotIn("email_domain", out.getvalue())
+        # RunPython sans accès aux données (index CONCURRENTLY) et applications de Django ignorés
+        self.assertNotIn("0009_contact_search_trigram_indexes", out.getvalue())
+        self.assertNotIn("contenttypes.", out.getvalue())
+    
+    def test_lock_check_inspects_database_operations_and_unknown_volume(self):
+        """database_operations examinées ; reltuples négatif (jamais analysée) = volume inconnu"""
+        from unittest import mock
+        from django.db import migrations, models
+        from portfolio.management.commands.check_migration_locks import Command
+        command = Command()
+        wrapped = migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.AddIndex('contact', models.Index(fields=['email'], name='email_idx'))],
+            state_operations=[migrations.AlterModelOptions('contact', {})],
+        )
+        operations = list(command.database_operations([wrapped]))
+        self.assertEqual([type(operation).__name__ for operation in operations], ['AddIndex'])
+        self.assertIsNotNone(command.blocking_reason(operations[0], 'postgresql'))
+        
+        connection = mock.MagicMock(vendor='postgresql')
+        connection.cursor.return_value.__enter__.return_value.fetchone.return_value = (-1,)
+        command.estimates = {}
+        self.assertIsNone(command.estimate_rows(connection, 'portfolio_contact'))
+
+class ContactExportTest(APITestCase):
+    """Tests pour l'export CSV/XLSX en flux des contacts"""
+    
+    def setUp(self):
+        """Admin et quelques messages"""
+        self.admin_user = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin123'
+        )
+        self.url = reverse('contact-export')
+        Contact.objects.create(nom="Alice", email="a@example.com", type_projet="app_web", message="=1+1")
+        Contact.objects.create(nom="Bob", email="b@example.com", type_projet="script", message="Python", traite=True)
+    
+    def test_export_requires_admin(self):
+        """L'export est réservé aux administrateurs"""
+        response = self.client.get(self.url)
+        self.assertIn(response.status_code, [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN])
+    
+    def test_csv_export_honours_filters(self):
+        """filterset_fields et search s'appliquent ; les formules sont neutralisées"""
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.url, {'type_projet': 'app_web'})
+        content = b''.join(response.streaming_content).decode()
+        lines = content.lstrip('\ufeff').splitlines()
+        self.assertEqual(lines[0], 'id,nom,email,type_projet,budget,message,date_envoi,traite')
+        self.assertEqual(len(lines), 2)
+        self.assertIn("'=1+1", lines[1])
+        response = self.client.get(self.url, {'search': 'python'})
+        self.assertIn('Bob', b''.join(response.streaming_content).decode())
+    
+    def test_xlsx_export(self):
+        """Le classeur XLSX est une archive valide contenant les lignes"""
+        import io
+        import zipfile
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.url, {'file_format': 'xlsx', 'traite': 'true'})
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        sheet = archive.read('xl/worksheets/sheet1.xml').decode()
+        self.assertIn('Bob', sheet)
+        self.assertNotIn('Alice', sheet)
+    
+    def test_memory_stays_flat_on_500k_rows(self):
+        """La mémoire résidente reste stable en exportant 500 000 lignes"""
+        import os
+        from django.db import connection
+        if not os.path.exists('/proc/self/statm'):
+            self.skipTest("Mesure de RSS disponible uniquement sous Linux")
+        
+        def rss_mb():
+            with open('/proc/self/statm') as handle:
+                return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+        
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 500000) "
+                "INSERT INTO portfolio_contact (nom, email, type_projet, budget, message, date_envoi, traite) "
+                "SELECT 'Nom ' || i, 'contact' || i || '@example.com', 'autre', '', "
+                "'Message de test assez long pour peser dans la mémoire ' || i, '2026-01-01 00:00:00', 0 FROM n"
+            )
+        self.client.force_authenticate(user=self.admin_user)
+        baseline = rss_mb()
+        response = self.client.get(self.url)
+        samples, lines = [], 0
+        for chunk in response.streaming_content:
+            lines += 1
+            if lines % 50000 == 0:
+                samples.append(rss_mb())
+        self.assertEqual(lines, 500003)
+        # La RSS ne croît pas avec le nombre de lignes exportées
+        self.assertLess(max(samples) - baseline, 30, (baseline, samples))
+
+class AdminPerformanceTest(TestCase):
+    """Tests pour les listes de l'admin (comptage, filtres en cache)"""
+    
+    def setUp(self):
+        """Superutilisateur connecté, projets liés à des technologies"""
+        from django.core.cache import cache
+        cache.clear()
+        self.admin_user = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin123'
+        )
+        self.client.force_login(self.admin_user)
+        self.python = Technology.objects.create(name="Python")
+        project = Project.objects.create(titre="Admin", description="A")
+        project.technologies.add(self.python)
+        Project.objects.create(titre="Autre", description="B")
+    
+    def test_technology_filter_uses_cached_choices(self):
+        """Le filtre technologie fonctionne et ses choix sont mis en cache"""
+        url = reverse('admin:portfolio_project_changelist')
+        response = self.client.get(url, {'technology': self.python.pk})
+        self.assertContains(response, "Admin")
+        self.assertNotContains(response, ">Autre<")
+        from django.core.cache import cache
+        from portfolio.signals import TECHNOLOGY_CHOICES_CACHE_KEY
+        self.assertEqual(cache.get(TECHNOLOGY_CHOICES_CACHE_KEY), [(self.python.pk, "Python")])
+        Technology.objects.create(name="Vue.js")
+        self.assertIsNone(cache.get(TECHNOLOGY_CHOICES_CACHE_KEY))
+    
+    def test_contact_changelist_uses_estimates_on_large_tables(self):
+        """Au-delà du seuil, le total affiché est l'estimation du planificateur"""
+        from unittest import mock
+        from portfolio.admin import EstimatedCountPaginator
+        Contact.objects.create(nom="Jean", email="j@example.com", type_projet="autre", message="M")
+        url = reverse('admin:portfolio_contact_changelist')
+        self.assertContains(self.client.get(url), "Jean")
+        with mock.patch('portfolio.admin.estimate_count', return_value=2000000):
+            self.assertEqual(EstimatedCountPaginator(Contact.objects.order_by('pk'), 100).count, 2000000)
+        with mock.patch('portfolio.admin.estimate_count', return_value=10):
+            self.assertEqual(EstimatedCountPaginator(Contact.objects.order_by('pk'), 100).count, 1)
+    
+    def test_contact_changelist_counts_exactly_when_searching(self):
+        """Avec une recherche ou un filtre actif, le comptage reste exact"""
+        from unittest import mock
+        Contact.objects.create(nom="Jean", email="j@example.com", type_projet="autre", message="M")
+        Contact.objects.create(nom="Paul", email="p@example.com", type_projet="autre", message="M")
+        url = reverse('admin:portfolio_contact_changelist')
+        with mock.patch('portfolio.admin.estimate_count', return_value=2000000) as estimate:
+            self.assertEqual(self.client.get(url).context['cl'].paginator.count, 2000000)
+            estimate.reset_mock()
+            response = self.client.get(url, {'q': 'jean'})
+            self.assertEqual(response.context['cl'].paginator.count, 1)
+            response = self.client.get(url, {'traite__exact': '0'})
+            self.assertEqual(response.context['cl'].paginator.count, 2)
+            estimate.assert_not_called()
+
+
+class BatchAPITest(APITestCase):
+    """Tests pour le regroupement de lectures (/api/batch/)"""
+    
+    def setUp(self):
+        """Un projet publié et un message de contact"""
+        Project.objects.create(titre="Batch", description="B", est_publie=True)
+        Contact.objects.create(nom="Jean", email="j@example.com", type_projet="autre", message="M")
+        self.url = reverse('batch')
+    
+    def test_batch_combines_responses_in_order(self):
+        """Chaque sous-requête a son statut et ses données, dans l'ordre"""
+        response = self.client.post(self.url, {'requests': [
+            {'path': '/api/projects/'},
+            {'path': '/api/technologies/?search=py'},
+            {'path': '/api/inconnu/'},
+            {'path': '/api/contact/', 'method': 'POST'},
+            {'path': '/api/batch/'},
+            {'path': '/api/projects/', 'method': None},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['responses']
+        self.assertEqual([item['status'] for item in results], [200, 200, 404, 400, 404, 400])
+        self.assertEqual(results[0]['data']['results'][0]['titre'], "Batch")
+        self.assertEqual(results[1]['path'], '/api/technologies/?search=py')
+    
+    def test_batch_isolates_failing_sub_requests(self):
+        """La racine de l'API est servie ; une vue en erreur donne un 500 pour son seul élément"""
+        from unittest import mock
+        with mock.patch('portfolio.views.TechnologyViewSet.list', side_effect=RuntimeError("panne")), \
+                self.assertLogs('portfolio.views', level='ERROR'):
+            response = self.client.post(self.url, {'requests': [
+                {'path': '/api/'},
+                {'path': '/api/technologies/'},
+                {'path': '/api/projects/'},
+            ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['responses']
+        self.assertEqual([item['status'] for item in results], [200, 500, 200])
+        self.assertIn('projects', results[0]['data'])
+    
+    def test_batch_ignores_session_authentication(self):
+        """Une session admin sans jeton CSRF n'est pas refusée : l'appel est anonyme"""
+        from rest_framework.test import APIClient
+        User.objects.create_superuser(username='admin', email='a@example.com', password='admin123')
+        client = APIClient(enforce_csrf_checks=True)
+        client.login(username='admin', password='admin123')
+        response = client.post(self.url, {'requests': [{'path': '/api/contact/?archived=true'}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['responses'][0]['status'], status.HTTP_403_FORBIDDEN)
+    
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_batch_rejects_too_many_requests(self):
+        """Au-delà de BATCH_MAX_REQUESTS, la requête entière est refusée"""
+        response = self.client.post(self.url, {'requests': [{'path': '/api/projects/'}] * 3}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, {'requests': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_batch_shares_authentication(self):
+        """Les sous-requêtes héritent de l'utilisateur de la requête englobante"""
+        from django.utils import timezone
+        ArchivedContact.objects.create(
+            id=99, nom="Jean", email="j@example.com", type_projet="autre", message="M", date_envoi=timezone.now()
+        )
+        batch = {'requests': [{'path': '/api/contact/?archived=true'}]}
+        response = self.client.post(self.url, batch, format='json')
+        self.assertEqual(response.data['responses'][0]['status'], status.HTTP_403_FORBIDDEN)
+        admin_user = User.objects.create_superuser(username='admin', email='a@example.com', password='admin123')
+        self.client.force_authenticate(user=admin_user)
+        response = self.client.post(self.url, batch, format='json')
+        self.assertEqual(response.data['responses'][0]['status'], status.HTTP_200_OK)
+        self.assertEqual(response.data['responses'][0]['data']['results'][0]['nom'], "Jean")
+
+
+class AdminLoginGuardTest(APITestCase):
+    """Tests pour la connexion admin (hachage borné, cache des échecs)"""
+    
+    def setUp(self):
+        """Administrateur et cache vide"""
+        from django.core.cache import cache
+        cache.clear()
+        self.admin_user = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin123'
+        )
+        self.url = reverse('admin-login')
+    
+    def test_login_without_session(self):
+        """Un client par token peut se connecter sans créer de session"""
+        from django.contrib.sessions.models import Session
+        response = self.client.post(self.url, {'username': 'admin', 'password': 'admin123', 'session': False}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Session.objects.count(), 0)
+        self.admin_user.refresh_from_db()
+        self.assertIsNotNone(self.admin_user.last_login)
+        response = self.client.post(self.url, {'username': 'admin', 'password': 'admin123'}, format='json')
+        self.assertEqual(Session.objects.count(), 1)
+        self.assertEqual(response.data['token'], self.admin_user.auth_token.key)
+    
+    def test_unknown_username_is_not_hashed_twice(self):
+        """Un nom inconnu est mémorisé jusqu'à la création du compte"""
+        from unittest import mock
+        from django.contrib.auth.hashers import make_password
+        with mock.patch('portfolio.login_guard.make_password', wraps=make_password) as hashing:
+            for _ in range(2):
+                response = self.client.post(self.url, {'username': 'ghost', 'password': 'x'}, format='json')
+                self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(hashing.call_count, 1)
+        User.objects.create_user(username='ghost', password='boo12345', is_staff=True)
+        response = self.client.post(self.url, {'username': 'ghost', 'password': 'boo12345'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    @override_settings(LOGIN_MAX_FAILURES=3)
+    def test_ip_locked_out_after_failures(self):
+        """Après LOGIN_MAX_FAILURES échecs, l'IP est bloquée sans hachage"""
+        for _ in range(3):
+            response = self.client.post(self.url, {'username': 'admin', 'password': 'faux'}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(self.url, {'username': 'admin', 'password': 'admin123'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(response['Retry-After']), 0)
+    
+    def test_hash_pool_rejects_when_full(self):
+        """Pool saturé : la tentative est refusée au lieu d'attendre"""
+        import threading
+        from portfolio.login_guard import HashPool, LoginThrottled
+        pool, started, release = HashPool(threads=1, queue=0), threading.Event(), threading.Event()
+        
+        def slow_hash():
+            started.set()
+            release.wait()
+        
+        worker = threading.Thread(target=pool.run, args=(slow_hash,))
+        worker.start()
+        try:
+            started.wait()
+            with self.assertRaises(LoginThrottled):
+                pool.run(len, 'x')
+        finally:
+            release.set()
+            worker.join()
+        self.assertEqual(pool.run(len, 'x'), 1)
+
+
+@override_settings(CHANGE_FEED_SETTLE_SECONDS=0)
+class SearchCacheTest(APITestCase):
+    """Tests pour le cache des résultats de recherche"""
+    
+    def setUp(self):
+        """Projets publiés et cache vide"""
+        from portfolio.search_cache import search_cache
+        self.cache = search_cache()
+        self.cache.clear()
+        self.python = Technology.objects.create(name="Python")
+        self.api = Project.objects.create(titre="API Django", description="Python et Django", est_publie=True)
+        self.api.technologies.add(self.python)
+        Project.objects.create(titre="Site Vue", description="Vue.js", est_publie=True)
+        self.url = reverse('project-list')
+    
+    def test_search_ids_are_cached_and_normalized(self):
+        """Même recherche (casse, ordre des termes) : servie par le cache"""
+        first = self.client.get(self.url, {'search': 'django Python'})
+        hits = self.cache.hits
+        second = self.client.get(self.url, {'search': 'PYTHON  django'})
+        self.assertEqual(self.cache.hits, hits + 1)
+        self.assertEqual(first.data['results'], second.data['results'])
+        self.assertEqual([p['titre'] for p in second.data['results']], ["API Django"])
+        # Les autres filtres s'appliquent au résultat mis en cache
+        response = self.client.get(self.url, {'search': 'django python', 'technology': 'vue'})
+        self.assertEqual(response.data['count'], 0)
+    
+    def test_project_change_invalidates_cache(self):
+        """Une modification de projet change la version du contenu"""
+        self.client.get(self.url, {'search': 'vue'})
+        self.api.description = "Python, Django et Vue"
+        self.api.save()
+        response = self.client.get(self.url, {'search': 'vue'})
+        self.assertEqual(response.data['count'], 2)
+    
+    @override_settings(CHANGE_FEED_SETTLE_SECONDS=60)
+    def test_lower_seq_committed_late_is_not_missed(self):
+        """Un seq inférieur validé après un seq supérieur ne laisse pas d'ids périmés"""
+        from datetime import timedelta
+        from django.utils import timezone
+        from portfolio.models import ChangeLog
+        settled = timezone.now() - timedelta(seconds=120)
+        ChangeLog.objects.update(date=settled)
+        # T2 (seq élevé) validée pendant que T1 (seq inférieur) est encore ouverte
+        ChangeLog.objects.create(seq=1000, model='project', object_id=str(self.api.pk), action='updated')
+        self.assertEqual(self.client.get(self.url, {'search': 'vue'}).data['count'], 1)
+        # T1 devient visible : son seq est inférieur au dernier seq déjà observé
+        late = Project.objects.create(titre="Vue tardif", description="Vue.js", est_publie=True)
+        ChangeLog.objects.filter(model='project', object_id=str(late.pk)).update(seq=500)
+        ChangeLog.objects.update(date=settled)
+        self.assertEqual(self.client.get(self.url, {'search': 'vue'}).data['count'], 2)
+    
+    def test_tinylfu_keeps_popular_entries(self):
+        """Une clé vue une seule fois n'évince pas une clé fréquente"""
+        from portfolio.search_cache import TinyLFUCache
+        cache = TinyLFUCache(max_bytes=100)
+        for _ in range(5):
+            cache.get('populaire')
+        self.assertTrue(cache.set('populaire', 'a', 60))
+        cache.get('rare')
+        self.assertFalse(cache.set('rare', 'b', 60))
+        self.assertEqual(cache.get('populaire'), 'a')
+        for _ in range(10):
+            cache.get('nouvelle')
+        self.assertTrue(cache.set('nouvelle', 'c', 60))
+        self.assertIsNone(cache.get('populaire'))
+        self.assertLessEqual(cache.used, 100)
+
+
+class QueryBudgetTest(QueryBudgetAssertionsMixin, APITestCase):
+    """Budgets de requêtes SQL des points de terminaison (détection des N+1)"""
+    
+    def setUp(self):
+        """Dix projets publiés liés à deux technologies, des messages de contact"""
+        from portfolio.search_cache import search_cache
+        search_cache().clear()
+        technologies = [Technology.objects.create(name=name) for name in ("Python", "Django", "Vue.js")]
+        for index in range(10):
+            project = Project.objects.create(
+                titre=f"Projet {index}", slug=f"projet-{index}", description="Python", est_publie=True
+            )
+            project.technologies.add(*technologies[index % 2:index % 2 + 2])
+        for index in range(10):
+            Contact.objects.create(nom=f"Nom {index}", email=f"n{index}@example.com", type_projet="autre", message="M")
+        self.admin_user = User.objects.create_superuser(username='admin', email='a@example.com', password='admin123')
+    
+    def test_public_endpoints_within_budget(self):
+        """Listes, recherche et détail restent dans leur budget"""
+        for url in (
+            reverse('project-list'),
+            reverse('project-list') + '?search=python',
+            reverse('project-detail', kwargs={'slug': 'projet-3'}),
+            reverse('technology-list') + '?search=py',
+            reverse('category-list'),
+        ):
+            self.assertWithinQueryBudget(self.client.get(url))
+    
+    def test_contact_endpoints_within_budget(self):
+        """Boîte de réception admin : pas de requête par message"""
+        self.client.force_authenticate(user=self.admin_user)
+        self.assertWithinQueryBudget(self.client.get(reverse('contact-list')))
+        contact = Contact.objects.first()
+        self.assertWithinQueryBudget(self.client.get(reverse('contact-detail', kwargs={'pk': contact.pk})))
+    
+    def test_n_plus_one_is_logged_and_aggregated(self):
+        """Sans prefetch, le dépassement est journalisé en JSON avec son origine"""
+        import json
+        import os
+        import tempfile
+        from unittest import mock
+        from portfolio.views import ProjectViewSet
+        
+        def unoptimized(view):
+            return Project.objects.filter(est_publie=True).order_by('-date_creation')
+        
+        with mock.patch.object(ProjectViewSet, 'get_queryset', unoptimized), \
+                self.assertLogs('portfolio.query_budget', level='WARNING') as logs:
+            response = self.client.get(reverse('project-list'))
+        self.assertIn('queries', response.query_budget.violations())
+        event = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(event['endpoint'], 'project-list')
+        repeated = event['top_statements'][0]
+        self.assertEqual(repeated['count'], 10)
+        self.assertIn('ProjectSerializer', repeated['origin'])
+        
+        with tempfile.NamedTemporaryFile('w', suffix='.log', delete=False) as log_file:
+            log_file.write('app[web.1]: ' + logs.records[-1].getMessage() + '\n')
+        self.addCleanup(os.remove, log_file.name)
+        out = StringIO()
+        call_command('query_budget_report', log_file.name, stdout=out)
+        self.assertIn('project-list', out.getvalue())
+        self.assertIn('ProjectSerializer', out.getvalue())
@@ -2,7 +2,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework.documentation import include_docs_urls
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
-from .views import ProjectViewSet, CategoryViewSet, TechnologyViewSet, ContactViewSet
+from .views import ProjectViewSet, CategoryViewSet, TechnologyViewSet, ContactViewSet, ChangeFeedView, BatchView
 from .auth_views import AdminLoginView
 
 router = DefaultRouter()
@@ -13,6 +13,10 @@ router.register(r'contact', ContactViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    # Flux de modifications (synchronisation incrémentale)
+    path('changes/', ChangeFeedView.as_view(), name='changes'),
+    # Regroupement de lectures (une requête HTTP pour plusieurs GET)
+    path('batch/', BatchView.as_view(), name='batch'),
     # Authentification admin
     path('admin/login/', AdminLoginView.as_view(), name='admin-login'),
     # Documentation API
@@ -1,20 +1,34 @@
-from rest_framework import viewsets, permissions, filters, status
+from django.conf import settings
+from rest_framework import viewsets, permissions, filters, status, exceptions
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Project, Category, Technology, Contact
+from .models import Project, Category, Technology, Contact, ArchivedContact, ChangeLog
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.authentication import TokenAuthentication, BasicAuthentication
+from rest_framework.decorators import action
+from django.http import StreamingHttpResponse, Http404
+from django.core.handlers.wsgi import WSGIRequest
+from django.urls import resolve
+from io import BytesIO
+import json
+import logging
 from django.contrib.auth import authenticate, login
-from .serializers import ProjectSerializer, CategorySerializer, TechnologySerializer, ContactSerializer
+from .serializers import ProjectSerializer, CategorySerializer, TechnologySerializer, ContactSerializer, ArchivedContactSerializer
+from .filters import CachedSearchFilter, ProjectFilter
+from .exports import stream_csv, stream_xlsx
 
 # Vues existantes...
 
 from .permissions import IsAdminOrReadOnly, IsAuthenticatedOrReadOnly
 
+logger = logging.getLogger(__name__)
+
 class ProjectViewSet(viewsets.ModelViewSet):
     """
     Point de terminaison API pour les projets.
     - Lecture publique pour tous les projets publiés
     - Écriture réservée aux administrateurs
+    - ?search= : identifiants des résultats en cache (voir search_cache.py)
     """
     queryset = Project.objects.filter(est_publie=True).order_by('-date_creation')
     serializer_class = ProjectSerializer
@@ -25,13 +39,18 @@ class ProjectViewSet(viewsets.ModelViewSet):
     authentication_classes = []
     
     # Filtres et recherche
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, CachedSearchFilter, filters.OrderingFilter]
+    filterset_class = ProjectFilter
     search_fields = ['titre', 'description', 'technologie']
     ordering_fields = ['date_creation', 'titre']
     
     def get_queryset(self):
         """Optimisation des requêtes"""
-        return Project.objects.filter(est_publie=True).order_by('-date_creation')
+        return (
+            Project.objects.filter(est_publie=True)
+            .prefetch_related('technologies')
+            .order_by('-date_creation')
+        )
 
 class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -48,14 +67,17 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
 class TechnologyViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Point de terminaison API pour les technologies (lecture seule).
+    - project_count est un compteur maintenu à l'écriture (pas de GROUP BY)
+    - ?search= : identifiants des résultats en cache (voir search_cache.py)
     """
-    queryset = Technology.objects.all()
+    queryset = Technology.objects.all().order_by('name')
     serializer_class = TechnologySerializer
     permission_classes = [permissions.AllowAny]
     
     # Filtres et recherche
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [CachedSearchFilter, filters.OrderingFilter]
     search_fields = ['name']
+    ordering_fields = ['name', 'project_count']
 
 class ContactViewSet(viewsets.ModelViewSet):
     """
@@ -63,6 +85,8 @@ class ContactViewSet(viewsets.ModelViewSet):
     - Lecture réservée aux administrateurs
     - Création autorisée pour tous (formulaire de contact)
     - Modification/Suppression réservée aux administrateurs
+    - ?archived=true : messages archivés (lecture seule, administrateurs)
+    - export/ : export CSV/XLSX en flux (administrateurs)
     """
     queryset = Contact.objects.all().order_by('-date_envoi')
     serializer_class = ContactSerializer
@@ -74,8 +98,34 @@ class ContactViewSet(viewsets.ModelViewSet):
     search_fields = ['nom', 'email', 'message']
     ordering_fields = ['date_envoi', 'nom']
     
+    # Colonnes de l'export CSV/XLSX
+    export_fields = ['id', 'nom', 'email', 'type_projet', 'budget', 'message', 'date_envoi', 'traite']
+    
+    @property
+    def archived(self):
+        """Vrai si la requête cible les messages archivés"""
+        return self.request.query_params.get('archived', '').lower() in ('true', '1')
+    
+    def get_queryset(self):
+        """La boîte de réception ne lit que la table des messages récents"""
+        if self.archived:
+            return ArchivedContact.objects.all().order_by('-date_envoi')
+        return super().get_queryset()
+    
+    def get_serializer_class(self):
+        if self.archived:
+            return ArchivedContactSerializer
+        return super().get_serializer_class()
+    
     def get_permissions(self):
         """Permissions personnalisées selon l'action"""
+        if self.archived:
+            # Les archives sont en lecture seule et réservées aux administrateurs
+            if self.action not in ['list', 'retrieve', 'metadata', 'export']:
+                raise exceptions.MethodNotAllowed(self.request.method)
+            return [permissions.IsAdminUser()]
+        if self.action == 'export':
+            return [permissions.IsAdminUser()]
         if self.action == 'create':
             # Tout le monde peut créer un message de contact
             return [permissions.AllowAny()]
@@ -85,3 +135,190 @@ class ContactViewSet(viewsets.ModelViewSet):
         else:
             # Seuls les administrateurs peuvent modifier/supprimer
             return [IsAdminOrReadOnly()]
+    
+    @action(detail=False, methods=['get'], pagination_class=None)
+    def export(self, request):
+        """
+        Export des messages filtrés (type_projet, traite, search, ordering) :
+        ?file_format=csv (défaut) ou xlsx. Les lignes sont lues par un curseur
+        côté serveur et envoyées au fil de l'eau : mémoire constante.
+        """
+        file_format = request.query_params.get('file_format', 'csv').lower()
+        if file_format not in ('csv', 'xlsx'):
+            return Response({'detail': "file_format doit valoir 'csv' ou 'xlsx'"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .values_list(*self.export_fields)
+            .iterator(chunk_size=2000)
+        )
+        if file_format == 'xlsx':
+            content = stream_xlsx(self.export_fields, rows)
+            content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        else:
+            content = stream_csv(self.export_fields, rows)
+            content_type = 'text/csv; charset=utf-8'
+        filename = 'contacts-archives' if self.archived else 'contacts'
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}.{file_format}"'
+        return response
+
+class ChangeFeedView(APIView):
+    """
+    Flux des modifications pour la synchronisation incrémentale.
+    GET /api/changes/?since=<seq>&limit=<n>
+    - Sans `since` : renvoie seulement le jeton courant (après un chargement complet)
+    - Renvoie la dernière version de chaque enregistrement modifié, ou un
+      tombstone {"action": "deleted"} s'il a été supprimé (ou dépublié)
+    - Les contacts ne sont visibles que par les administrateurs
+    """
+    permission_classes = [permissions.AllowAny]
+    max_limit = 1000
+
+    def get_sources(self, request):
+        """Modèles visibles -> (queryset d'hydratation, sérialiseur)"""
+        sources = {
+            'project': (Project.objects.filter(est_publie=True).prefetch_related('technologies'), ProjectSerializer),
+            'category': (Category.objects.all(), CategorySerializer),
+            'technology': (Technology.objects.all(), TechnologySerializer),
+        }
+        if request.user and request.user.is_staff:
+            sources['contact'] = (Contact.objects.all(), ContactSerializer)
+        return sources
+
+    def get_log(self):
+        """
+        Entrées publiables : toute transaction ayant obtenu un seq inférieur
+        est terminée (les seq peuvent être validés dans le désordre, voir ChangeLog)
+        """
+        return ChangeLog.objects.filter(ChangeLog.settled())
+
+    def get(self, request):
+        log = self.get_log()
+        latest = log.order_by('-seq').values_list('seq', flat=True).first() or 0
+        since = request.query_params.get('since')
+        if since is None:
+            return Response({'changes': [], 'next': str(latest), 'has_more': False})
+        try:
+            since = int(since)
+            limit = min(int(request.query_params.get('limit', 500)), self.max_limit)
+            if limit < 1:
+                raise ValueError(limit)
+        except ValueError:
+            return Response({'detail': "Paramètres 'since' et 'limit' entiers attendus (limit >= 1)"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        sources = self.get_sources(request)
+        entries = list(
+            log.filter(seq__gt=since, model__in=list(sources))
+            .order_by('seq')[:limit]
+        )
+        has_more = len(entries) == limit
+        # Sans entrée renvoyée, le jeton n'avance pas : rien ne doit être sauté
+        next_token = entries[-1].seq if entries else since
+
+        # Une seule entrée par enregistrement : la plus récente
+        last_entry = {}
+        for entry in entries:
+            last_entry[(entry.model, entry.object_id)] = entry
+
+        # Hydratation : une requête par modèle
+        current = {}
+        for model_name, (queryset, serializer_class) in sources.items():
+            ids = [object_id for (name, object_id) in last_entry if name == model_name]
+            if ids:
+                for obj in queryset.filter(pk__in=ids):
+                    current[(model_name, str(obj.pk))] = serializer_class(obj, context={'request': request}).data
+
+        changes = []
+        for key, entry in sorted(last_entry.items(), key=lambda item: item[1].seq):
+            data = current.get(key)
+            changes.append({
+                'seq': entry.seq,
+                'model': entry.model,
+                'id': entry.object_id,
+                'action': entry.action if data is not None else 'deleted',
+                'data': data,
+            })
+        return Response({'changes': changes, 'next': str(next_token), 'has_more': has_more})
+
+
+class BatchView(APIView):
+    """
+    Regroupe plusieurs lectures en une seule requête HTTP.
+    POST /api/batch/ {"requests": [{"path": "/api/projects/?page=2"}, ...]}
+    - Sous-requêtes GET uniquement, exécutées dans le processus, avec la même
+      connexion à la base et l'authentification de la requête englobante
+    - Au plus BATCH_MAX_REQUESTS sous-requêtes
+    - Réponse : {"responses": [{"path", "status", "data"}, ...]} dans l'ordre ;
+      une sous-requête en erreur donne un statut 500 sans interrompre les autres
+    - Authentification par token (ou Basic) : pas de session, donc pas de
+      vérification CSRF sur ce POST ; un appel avec la seule session est anonyme
+    """
+    authentication_classes = [TokenAuthentication, BasicAuthentication]
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request):
+        sub_requests = request.data.get('requests') if isinstance(request.data, dict) else None
+        if not isinstance(sub_requests, list) or not sub_requests:
+            return Response({'detail': "'requests' doit être une liste non vide"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(sub_requests) > settings.BATCH_MAX_REQUESTS:
+            return Response({'detail': f"Au plus {settings.BATCH_MAX_REQUESTS} sous-requêtes"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        responses = []
+        for item in sub_requests:
+            path = item.get('path') if isinstance(item, dict) else None
+            method = item.get('method', 'GET') if isinstance(item, dict) else None
+            if not isinstance(path, str) or not isinstance(method, str) or method.upper() != 'GET':
+                responses.append({'path': path, 'status': status.HTTP_400_BAD_REQUEST,
+                                  'data': {'detail': "Sous-requête GET avec 'path' attendue"}})
+                continue
+            responses.append(self.dispatch_sub_request(request, path))
+        return Response({'responses': responses})
+
+    def dispatch_sub_request(self, request, path):
+        """Exécute une sous-requête GET sur une route de l'API"""
+        path_info, _, query_string = path.partition('?')
+        try:
+            match = resolve(path_info)
+        except Http404:
+            match = None
+        if match is None or not path_info.startswith('/api/') or getattr(match.func, 'view_class', None) is BatchView:
+            return {'path': path, 'status': status.HTTP_404_NOT_FOUND, 'data': {'detail': "Route inconnue"}}
+
+        environ = request._request.META.copy()
+        environ.update({
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path_info,
+            'QUERY_STRING': query_string,
+            'CONTENT_LENGTH': '0',
+            'wsgi.input': BytesIO(b''),
+        })
+        environ.pop('CONTENT_TYPE', None)
+        sub_request = WSGIRequest(environ)
+        # Renseigné par le gestionnaire de requêtes pour une requête normale (utilisé par APIRootView)
+        sub_request.resolver_match = match
+        # Authentification partagée : pas de nouvelle vérification du token
+        sub_request._force_auth_user = request.user
+        sub_request._force_auth_token = request.auth
+
+        try:
+            response = match.func(sub_request, *match.args, **match.kwargs)
+        except Exception:
+            logger.exception("Sous-requête groupée en erreur : %s", path)
+            return {'path': path, 'status': status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    'data': {'detail': "Erreur interne"}}
+        if isinstance(response, StreamingHttpResponse):
+            return {'path': path, 'status': status.HTTP_400_BAD_REQUEST,
+                    'data': {'detail': "Réponse en flux non supportée"}}
+        if hasattr(response, 'data'):
+            # Réponse DRF : données brutes, rendues une seule fois avec la réponse globale
+            data = response.data
+        else:
+            try:
+                data = json.loads(response.content)
+            except ValueError:
+                data = response.content.decode(errors='replace')
+        return {'path': path, 'status': response.status_code, 'data': data}
@@ -0,0 +1,103 @@
+"""
+Préchauffage d'un processus Django (commande `warmup` et hooks gunicorn).
+
+Charge l'URLconf, ouvre les connexions aux bases, puis exécute en interne les
+requêtes publiques les plus fréquentes pour que les imports paresseux, les
+connexions et les caches existants soient prêts avant la première vraie requête.
+
+Les connexions Django sont propres à chaque thread : avec des workers à
+threads, warmed_thread_pool() ouvre aussi celles de chaque thread de requêtes.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver, reverse
+
+logger = logging.getLogger(__name__)
+
+
+def _elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def warmup_paths(top=5):
+    """Chemins à préchauffer : listes publiques et détails des N derniers projets"""
+    from .models import Project
+
+    paths = [
+        reverse('project-list'),
+        reverse('category-list'),
+        reverse('technology-list'),
+    ]
+    slugs = (
+        Project.objects.filter(est_publie=True)
+        .order_by('-date_creation')
+        .values_list('slug', flat=True)[:top]
+    )
+    paths += [reverse('project-detail', kwargs={'slug': slug}) for slug in slugs]
+    return paths
+
+
+def warm_connections():
+    """Ouvre les connexions du thread courant ; retourne une liste de (alias, durée en ms)"""
+    timings = []
+    for alias in connections:
+        start = time.perf_counter()
+        connections[alias].ensure_connection()
+        timings.append((f'db:{alias}', _elapsed_ms(start)))
+    return timings
+
+
+def _warm_thread():
+    # Une exception dans l'initializer casserait tout le pool : la requête se reconnectera
+    try:
+        warm_connections()
+    except Exception:
+        logger.exception("Préchauffage des connexions du thread %s échoué", threading.current_thread().name)
+
+
+def warmed_thread_pool(threads, timeout=30):
+    """
+    Pool de `threads` threads, tous démarrés et connectés aux bases avant le
+    retour (un ThreadPoolExecutor ne crée ses threads qu'à la demande).
+    """
+    executor = ThreadPoolExecutor(max_workers=threads, initializer=_warm_thread)
+    # Chaque tâche attend les autres : aucun thread libre, une tâche par nouveau thread
+    barrier = threading.Barrier(threads)
+    wait([executor.submit(barrier.wait, timeout) for _ in range(threads)], timeout=timeout)
+    return executor
+
+
+def warm_up(top=5):
+    """
+    Préchauffe le processus courant.
+    Retourne une liste de (étape, durée en ms) ; les requêtes sont jouées deux
+    fois pour comparer la latence à froid et à chaud.
+    """
+    from django.test import Client
+
+    timings = []
+
+    start = time.perf_counter()
+    resolver = get_resolver()
+    resolver.reverse_dict  # Force le chargement complet des routes
+    timings.append(('urlconf', _elapsed_ms(start)))
+
+    timings += warm_connections()
+
+    start = time.perf_counter()
+    paths = warmup_paths(top)
+    timings.append(('paths', _elapsed_ms(start)))
+
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')]
+    client = Client(HTTP_HOST=hosts[0] if hosts else 'localhost')
+    for phase in ('cold', 'warm'):
+        for path in paths:
+            start = time.perf_counter()
+            client.get(path, secure=not settings.DEBUG)
+            timings.append((f'{phase} GET {path}', _elapsed_ms(start)))
+    return timings